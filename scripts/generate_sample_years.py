@@ -17,6 +17,43 @@ import numpy as np
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.data.storage import write_processed_parquet
+from src.utils.group_ops import (
+    group_sort,
+    group_bounds,
+    group_zscore,
+    group_rolling_mean,
+    group_shift,
+    group_pct_change,
+)
+
+
+def shift_years(dates: pd.Series, years: int) -> np.ndarray:
+    """
+    Desloca datas em um número inteiro de anos com aritmética datetime64.
+
+    Mesma semântica de ``dates + pd.DateOffset(years=years)``: mantém mês e
+    dia, e 29/02 cai em 28/02 quando o ano alvo não é bissexto.
+
+    Args:
+        dates: Série datetime64
+        years: Número de anos (pode ser negativo)
+
+    Returns:
+        Array datetime64[ns] com as datas deslocadas
+    """
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    days = values.astype('datetime64[D]')
+    months = values.astype('datetime64[M]')
+
+    # Mês alvo e seu último dia, para limitar o dia do mês (29/02 -> 28/02)
+    target_month = months + np.timedelta64(12 * years, 'M')
+    target_start = target_month.astype('datetime64[D]')
+    target_end = (target_month + np.timedelta64(1, 'M')).astype('datetime64[D]') - np.timedelta64(1, 'D')
+
+    day_offset = np.minimum(days - months.astype('datetime64[D]'), target_end - target_start)
+    return target_start + day_offset + (values - days)
+
 
 def generate_year_data(base_df: pd.DataFrame, target_year: int) -> pd.DataFrame:
     """
@@ -29,42 +66,59 @@ def generate_year_data(base_df: pd.DataFrame, target_year: int) -> pd.DataFrame:
     Returns:
         DataFrame com dados do ano alvo
     """
-    df = base_df.copy()
-
-    # Ajusta as datas
-    df['date'] = pd.to_datetime(df['date'])
+    # Cópia rasa: todas as colunas alteradas abaixo são substituídas por
+    # arrays novos, então base_df continua intacto (Copy-on-Write) sem
+    # duplicar o DataFrame inteiro
+    df = base_df.copy(deep=False)
+
+    # Ajusta as datas (o Parquet já preserva datetime64; só converte se preciso)
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'])
     year_diff = target_year - 2023
-    df['date'] = df['date'] + pd.DateOffset(years=year_diff)
+    df['date'] = shift_years(df['date'], year_diff)
     df['year'] = target_year
 
-    # Adiciona variação realística aos dados
-    np.random.seed(target_year)  # Seed baseado no ano para consistência
+    # Adiciona variação realística aos dados com um gerador PCG64 próprio
+    # (seed baseado no ano para consistência, sem tocar no estado global)
+    rng = np.random.default_rng(target_year)
 
-    # Variação na carga (±5%)
-    df['val_cargaenergiamwmed'] = df['val_cargaenergiamwmed'] * (1 + np.random.uniform(-0.05, 0.05, len(df)))
+    # Sorteia todas as variações em um único bloco contíguo float32, uma
+    # linha por variável: carga (±5%), temperatura (±2°C), radiação (±10%)
+    # e precipitação (±20%)
+    half_range = np.array([[0.05], [2.0], [0.1], [0.2]], dtype=np.float32)
+    variation = rng.random((4, len(df)), dtype=np.float32)
+    variation *= 2 * half_range
+    variation -= half_range
+    variation[[0, 2, 3]] += 1.0  # Linhas multiplicativas viram fatores
 
-    # Variação na temperatura (±2°C)
-    temp_variation = np.random.uniform(-2, 2, len(df))
-    df['temp_mean'] = df['temp_mean'] + temp_variation
-    df['temp_min'] = df['temp_min'] + temp_variation
-    df['temp_max'] = df['temp_max'] + temp_variation
+    # Aplica as variações em duas operações sobre blocos de colunas
+    scaled_cols = ['val_cargaenergiamwmed', 'radiation_mean', 'precipitation_total']
+    scaled = df[scaled_cols].to_numpy(dtype=np.float64) * variation[[0, 2, 3]].T
+    np.maximum(scaled[:, 2], 0, out=scaled[:, 2])  # Precipitação não pode ser negativa
+    df[scaled_cols] = scaled
 
-    # Variação na radiação (±10%)
-    df['radiation_mean'] = df['radiation_mean'] * (1 + np.random.uniform(-0.1, 0.1, len(df)))
-
-    # Variação na precipitação (±20%)
-    df['precipitation_total'] = df['precipitation_total'] * (1 + np.random.uniform(-0.2, 0.2, len(df)))
-    df['precipitation_total'] = df['precipitation_total'].clip(lower=0)  # Não pode ser negativo
+    temp_cols = ['temp_mean', 'temp_min', 'temp_max']
+    df[temp_cols] = df[temp_cols].to_numpy(dtype=np.float64) + variation[1][:, np.newaxis]
 
     # Recalcula features derivadas
     if 'temp_range' in df.columns:
         df['temp_range'] = df['temp_max'] - df['temp_min']
 
+    # Ordena por região uma única vez; os kernels operam em arrays agrupados
+    codes, order = group_sort(df['region'])
+    bounds = group_bounds(codes)
+    load = df['val_cargaenergiamwmed'].to_numpy(dtype=np.float64)[order]
+    temp = df['temp_mean'].to_numpy(dtype=np.float64)[order]
+
+    def by_region(sorted_result: np.ndarray) -> np.ndarray:
+        """Devolve o resultado de um kernel para a ordem original das linhas."""
+        out = np.empty_like(sorted_result)
+        out[order] = sorted_result
+        return out
+
     if 'load_zscore' in df.columns:
         # Recalcula Z-score por região
-        df['load_zscore'] = df.groupby('region')['val_cargaenergiamwmed'].transform(
-            lambda x: (x - x.mean()) / x.std()
-        )
+        df['load_zscore'] = by_region(group_zscore(load, codes, bounds))
 
     if 'is_anomaly' in df.columns:
         df['is_anomaly'] = (df['load_zscore'].abs() > 3).astype(int)
@@ -75,14 +129,10 @@ def generate_year_data(base_df: pd.DataFrame, target_year: int) -> pd.DataFrame:
         col_temp = f'temp_ma_{window}d'
 
         if col_load in df.columns:
-            df[col_load] = df.groupby('region')['val_cargaenergiamwmed'].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
+            df[col_load] = by_region(group_rolling_mean(load, codes, window, bounds))
 
         if col_temp in df.columns:
-            df[col_temp] = df.groupby('region')['temp_mean'].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
+            df[col_temp] = by_region(group_rolling_mean(temp, codes, window, bounds))
 
     # Recalcula lag features se existirem
     for lag in [1, 7]:
@@ -90,10 +140,10 @@ def generate_year_data(base_df: pd.DataFrame, target_year: int) -> pd.DataFrame:
         col_temp = f'temp_lag_{lag}d'
 
         if col_load in df.columns:
-            df[col_load] = df.groupby('region')['val_cargaenergiamwmed'].shift(lag)
+            df[col_load] = by_region(group_shift(load, codes, lag))
 
         if col_temp in df.columns:
-            df[col_temp] = df.groupby('region')['temp_mean'].shift(lag)
+            df[col_temp] = by_region(group_shift(temp, codes, lag))
 
     # Recalcula interações se existirem
     if 'load_x_temp' in df.columns:
@@ -104,7 +154,7 @@ def generate_year_data(base_df: pd.DataFrame, target_year: int) -> pd.DataFrame:
 
     # Recalcula mom se existir
     if 'load_mom' in df.columns:
-        df['load_mom'] = df.groupby('region')['val_cargaenergiamwmed'].pct_change(periods=30)
+        df['load_mom'] = by_region(group_pct_change(load, codes, 30))
 
     return df
 
@@ -151,10 +201,9 @@ def main():
 
         # Salva
         output_path = Path(f"data/processed/energy_weather_{year}.parquet")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"\n💾 Salvando em {output_path}...")
-        df_year.to_parquet(output_path)
+        write_processed_parquet(df_year, output_path)
 
         file_size = output_path.stat().st_size / 1024  # KB
         print(f"   ✓ Arquivo salvo ({file_size:.1f} KB)")
@@ -7,24 +7,34 @@ em arquivos Parquet separados.
 
 Uso:
     python scripts/process_multiyear_data.py
+    python scripts/process_multiyear_data.py --refresh
 """
 
+import argparse
+import io
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
+from typing import Tuple
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.loaders import ONSLoader, INMETLoader
 from src.data.preprocessor import Preprocessor
+from src.data.storage import write_processed_parquet
 
 
-def process_year(year: int) -> bool:
+def process_year(year: int, refresh: bool = False) -> bool:
     """
     Processa dados de um ano específico.
 
     Args:
         year: Ano a ser processado
+        refresh: Revalida os arquivos brutos em cache junto ao servidor
+                 (ETag/Last-Modified) antes de processar
 
     Returns:
         True se sucesso, False caso contrário
@@ -41,11 +51,11 @@ def process_year(year: int) -> bool:
 
         # Carrega dados
         print(f"\n📊 Carregando dados do ONS ({year})...")
-        ons_df = ons_loader.load(year)
+        ons_df = ons_loader.load(year, refresh=refresh)
         print(f"   ✓ {len(ons_df):,} registros carregados")
 
         print(f"\n🌦️  Carregando dados do INMET ({year})...")
-        inmet_df = inmet_loader.load(year)
+        inmet_df = inmet_loader.load(year, refresh=refresh)
         print(f"   ✓ {len(inmet_df):,} registros carregados")
 
         # Processa
@@ -56,10 +66,9 @@ def process_year(year: int) -> bool:
 
         # Salva com nome específico do ano
         output_path = Path(f"data/processed/energy_weather_{year}.parquet")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"\n💾 Salvando em {output_path}...")
-        df.to_parquet(output_path)
+        write_processed_parquet(df, output_path)
 
         file_size = output_path.stat().st_size / 1024  # KB
         print(f"   ✓ Arquivo salvo ({file_size:.1f} KB)")
@@ -74,8 +83,36 @@ def process_year(year: int) -> bool:
         return False
 
 
+def process_year_captured(year: int, refresh: bool = False) -> Tuple[int, bool, str]:
+    """
+    Processa um ano capturando a saída do console.
+
+    Usado pelos workers do pool: cada ano acumula seu próprio log, que é
+    impresso de uma vez quando termina, evitando linhas intercaladas.
+
+    Args:
+        year: Ano a ser processado
+        refresh: Revalida os arquivos brutos em cache (ver process_year)
+
+    Returns:
+        Tupla (ano, sucesso, log capturado)
+    """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        success = process_year(year, refresh=refresh)
+    return year, success, buffer.getvalue()
+
+
 def main():
     """Processa múltiplos anos."""
+    parser = argparse.ArgumentParser(description="Processa dados do ONS e INMET por ano.")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="revalida os downloads em cache e reprocessa todos os anos"
+    )
+    args = parser.parse_args()
+
     print("🚀 Processamento de Dados Multi-Ano")
     print("=" * 60)
 
@@ -97,8 +134,13 @@ def main():
     print(f"   ✓ Já existem: {existing_years}")
     print(f"   ⚠️  Faltando: {missing_years}")
 
-    if not missing_years:
+    # Com --refresh, todos os anos são reprocessados a partir dos dados
+    # brutos revalidados (só baixa de novo o que mudou no servidor)
+    if args.refresh:
+        missing_years = years_to_process
+    elif not missing_years:
         print(f"\n✅ Todos os anos já foram processados!")
+        print(f"   Use --refresh para revalidar os downloads e reprocessar.")
         return
 
     # Pergunta se deve processar os faltantes
@@ -110,15 +152,29 @@ def main():
         print("❌ Processamento cancelado.")
         return
 
-    # Processa cada ano faltante
+    # Processa os anos faltantes em paralelo (um processo por ano)
     successful = []
     failed = []
 
-    for year in missing_years:
-        if process_year(year):
-            successful.append(year)
-        else:
-            failed.append(year)
+    max_workers = min(len(missing_years), os.cpu_count() or 1)
+    print(f"\n⚙️  Processando com {max_workers} processo(s) em paralelo...")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(process_year_captured, year, args.refresh)
+            for year in missing_years
+        ]
+
+        for future in as_completed(futures):
+            year, success, log = future.result()
+            print(log, end="")
+            if success:
+                successful.append(year)
+            else:
+                failed.append(year)
+
+    successful.sort()
+    failed.sort()
 
     # Resumo
     print(f"\n{'='*60}")
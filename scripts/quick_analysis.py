@@ -2,6 +2,7 @@
 Quick analysis of processed data to verify quality and generate insights.
 """
 
+import numpy as np
 import pandas as pd
 
 
@@ -22,31 +23,29 @@ def main():
 
     print(f"\n\nData Quality:")
     print(f"  - Missing values: {df.isnull().sum().sum()}")
-    print(f"  - Duplicates: {df.duplicated().sum()}")
+    print(f"  - Duplicates: {df.duplicated(subset=['date', 'region']).sum()}")
+
+    # One grouped pass with built-in (compiled) reductions for every table
+    region_stats = df.groupby('region').agg({
+        'val_cargaenergiamwmed': ['mean', 'std', 'min', 'max'],
+        'temp_mean': ['mean', 'std', 'min', 'max'],
+        'is_anomaly': ['sum', 'mean']
+    })
+    stat_names = {'mean': 'Mean', 'std': 'Std', 'min': 'Min', 'max': 'Max'}
 
     print(f"\n\nEnergy Load Statistics (MW):")
-    stats = df.groupby('region')['val_cargaenergiamwmed'].agg([
-        ('Mean', 'mean'),
-        ('Std', 'std'),
-        ('Min', 'min'),
-        ('Max', 'max')
-    ]).round(2)
+    stats = region_stats['val_cargaenergiamwmed'].rename(columns=stat_names).round(2)
     print(stats)
 
     print(f"\n\nTemperature Statistics (°C):")
-    temp_stats = df.groupby('region')['temp_mean'].agg([
-        ('Mean', 'mean'),
-        ('Std', 'std'),
-        ('Min', 'min'),
-        ('Max', 'max')
-    ]).round(2)
+    temp_stats = region_stats['temp_mean'].rename(columns=stat_names).round(2)
     print(temp_stats)
 
     print(f"\n\nAnomaly Detection Results:")
-    anomaly_counts = df.groupby('region')['is_anomaly'].agg([
-        ('Total_Anomalies', 'sum'),
-        ('Anomaly_Rate_%', lambda x: (x.sum() / len(x)) * 100)
-    ]).round(2)
+    anomaly_counts = pd.DataFrame({
+        'Total_Anomalies': region_stats[('is_anomaly', 'sum')],
+        'Anomaly_Rate_%': region_stats[('is_anomaly', 'mean')] * 100
+    }).round(2)
     print(anomaly_counts)
 
     print(f"\n\nTop 5 Anomalies (Highest Z-scores):")
@@ -60,9 +59,13 @@ def main():
     print(seasonal)
 
     print(f"\n\nCorrelation: Energy Load vs Temperature:")
-    corr = df.groupby('region').apply(
-        lambda x: x['val_cargaenergiamwmed'].corr(x['temp_mean'])
-    ).round(3)
+    # Pearson por região a partir de somas agrupadas (sem apply por grupo)
+    pair = df[['region', 'val_cargaenergiamwmed', 'temp_mean']].dropna()
+    by_region = pair.groupby('region')
+    dx = pair['val_cargaenergiamwmed'] - by_region['val_cargaenergiamwmed'].transform('mean')
+    dy = pair['temp_mean'] - by_region['temp_mean'].transform('mean')
+    sums = pd.DataFrame({'xy': dx * dy, 'xx': dx * dx, 'yy': dy * dy}).groupby(pair['region']).sum()
+    corr = (sums['xy'] / np.sqrt(sums['xx'] * sums['yy'])).round(3)
     print(corr)
 
     print("\n" + "=" * 70)
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 from src.data.preprocessor import Preprocessor
+from src.data.storage import write_processed_feather, write_processed_parquet
 
 
 def main():
@@ -31,7 +32,8 @@ def main():
     print(f"New features: {df_updated.shape[1]}")
 
     # Save
-    df_updated.to_parquet(data_path)
+    write_processed_parquet(df_updated, data_path)
+    write_processed_feather(df_updated, data_path.with_suffix(".feather"))
     print(f"\n✅ Updated data saved to {data_path}")
     print(f"   Added {df_updated.shape[1] - df.shape[1]} new features")
 
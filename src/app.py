@@ -5,16 +5,30 @@ Baseado na estrutura original do app.py da branch cadona,
 mas utilizando o pipeline robusto e funcionalidades avançadas.
 """
 
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Import pipeline robusto (loaders e Preprocessor são importados apenas
+# quando um ano precisa ser processado; o caso comum lê só o Parquet)
+from src.data.storage import (
+    MEASURED_COLUMNS,
+    downcast_numeric,
+    read_processed_table,
+    scan_processed_table,
+    write_processed_parquet,
+)
 
-# Import pipeline robusto
-from src.data.loaders import ONSLoader, INMETLoader
-from src.data.preprocessor import Preprocessor
-
-# Import funções do dashboard
-import src.dashboard as dashboard
 
 # ============================================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -62,19 +76,34 @@ st.markdown("""
 # CARREGAMENTO DE DADOS (Pipeline Robusto - Multi-Ano)
 # ============================================================================
 
+# Regiões do SIN, na ordem exibida no seletor
+REGION_NAMES = ["Sul", "Sudeste/Centro-Oeste", "Nordeste", "Norte"]
+
+# Tipos categóricos das colunas de texto (códigos inteiros em memória)
+REGION_DTYPE = pd.CategoricalDtype(categories=REGION_NAMES)
+SEASON_DTYPE = pd.CategoricalDtype(categories=["Summer", "Fall", "Winter", "Spring"])
+
 @st.cache_data(ttl=3600)
-def load_processed_data_single_year(year: int) -> pd.DataFrame:
+def load_processed_table_single_year(year: int, columns: Optional[tuple] = None) -> pa.Table:
     """
-    Carrega dados processados de um único ano.
+    Carrega dados processados de um único ano como tabela Arrow.
+
+    O cache guarda a tabela Arrow (serialização menor e mais rápida que a
+    de um DataFrame); a conversão para pandas fica a cargo de quem consome.
+    Com `columns`, apenas essas colunas são decodificadas do Parquet.
     """
     cache_path = Path(f"data/processed/energy_weather_{year}.parquet")
+    cols = list(columns) if columns else None
 
     if cache_path.exists():
-        return pd.read_parquet(cache_path)
+        return read_processed_table(cache_path, columns=cols)
 
     # Se não existe cache, roda pipeline
     st.info(f"⏳ Processando dados de {year}...")
     try:
+        from src.data.loaders import ONSLoader, INMETLoader
+        from src.data.preprocessor import Preprocessor
+
         ons_loader = ONSLoader()
         inmet_loader = INMETLoader()
         preprocessor = Preprocessor()
@@ -84,43 +113,233 @@ def load_processed_data_single_year(year: int) -> pd.DataFrame:
         df = preprocessor.process(ons_df, inmet_df, save=False)
 
         # Salva com nome específico do ano
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(cache_path)
+        write_processed_parquet(df, cache_path)
         st.success(f"✅ Dados de {year} processados com sucesso!")
 
-        return df
+        return pa.Table.from_pandas(df[cols] if cols else df, preserve_index=False)
     except Exception as e:
         st.warning(f"⚠️ Não foi possível carregar dados de {year}: {str(e)}")
-        return pd.DataFrame()
+        return pa.table({})
 
 
 @st.cache_data(ttl=3600)
-def load_processed_data_multi_year(years: list) -> pd.DataFrame:
+def load_processed_table_multi_year(years: list, columns: Optional[tuple] = None) -> pa.Table:
     """
-    Carrega dados processados de múltiplos anos.
+    Carrega dados processados de múltiplos anos como tabela Arrow.
+
+    Com `columns`, apenas essas colunas são decodificadas do Parquet.
     """
-    dfs = []
-    for year in years:
-        df_year = load_processed_data_single_year(year)
-        if not df_year.empty:
-            dfs.append(df_year)
-
-    if dfs:
-        df_combined = pd.concat(dfs, ignore_index=True)
-        df_combined = df_combined.sort_values('date').reset_index(drop=True)
-        return df_combined
+    year_paths = {year: Path(f"data/processed/energy_weather_{year}.parquet") for year in years}
+
+    # Anos sem cache passam pelo pipeline (que grava o Parquet do ano).
+    # Download e parse liberam o GIL, então os anos rodam em threads
+    # paralelas; o contexto do Streamlit é repassado para as mensagens.
+    missing_years = [year for year, path in year_paths.items() if not path.exists()]
+    if missing_years:
+        ctx = get_script_run_ctx()
+
+        def process_missing(year: int) -> pa.Table:
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return load_processed_table_single_year(year)
+
+        with ThreadPoolExecutor(max_workers=len(missing_years)) as executor:
+            list(executor.map(process_missing, missing_years))
+
+    paths = [path for path in year_paths.values() if path.exists()]
+
+    cols = list(columns) if columns else None
+    if paths:
+        # Um único scan Arrow sobre todos os anos: concatena sem cópia
+        # e ordena na própria tabela Arrow
+        return scan_processed_table(
+            paths,
+            columns=cols,
+            filter=ds.field('year').isin(list(years)),
+            sort_by='date'
+        )
     else:
         # Fallback para 2023 se nenhum ano foi carregado
         cache_path = Path("data/processed/energy_weather_processed.parquet")
         if cache_path.exists():
-            return pd.read_parquet(cache_path)
-        return pd.DataFrame()
+            return read_processed_table(
+                cache_path,
+                columns=cols,
+                filters=[('year', 'in', list(years))]
+            )
+        return pa.table({})
+
+
+def prepare_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajusta os tipos das colunas uma única vez, logo após a leitura.
+
+    A data fica como datetime64 (o Parquet já a preserva; só converte se
+    necessário), colunas numéricas são reduzidas para float32 (exceto a
+    carga medida, MEASURED_COLUMNS) e para o menor inteiro que comporta os
+    valores, e região e estação viram
+    categóricas: comparações e groupby passam a operar sobre códigos em vez
+    de strings.
+    """
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True)
+
+    # Números compactos: float32 basta para gráficos e correlações, mas a
+    # carga medida continua float64 (aparece nas tabelas e exportações);
+    # os inteiros (ano, mês, flags) cabem em int8/int16, e a flag de
+    # anomalia continua inteira (1 byte) para seguir nos seletores de
+    # variáveis numéricas, contada direto com np.count_nonzero
+    downcast_numeric(df, exclude=MEASURED_COLUMNS)
+
+    if 'region' in df.columns:
+        df['region'] = df['region'].astype(REGION_DTYPE)
+    if 'season' in df.columns:
+        df['season'] = df['season'].astype(SEASON_DTYPE)
+    return df
+
+
+def load_processed_data_single_year(year: int, columns: Optional[tuple] = None) -> pd.DataFrame:
+    """
+    Carrega dados processados de um único ano como DataFrame.
+    """
+    return prepare_dtypes(load_processed_table_single_year(year, columns).to_pandas(split_blocks=True))
+
+
+def load_processed_data_multi_year(years: list, columns: Optional[tuple] = None) -> pd.DataFrame:
+    """
+    Carrega dados processados de múltiplos anos como DataFrame.
+    """
+    return prepare_dtypes(load_processed_table_multi_year(years, columns).to_pandas(split_blocks=True))
 
 
 # Anos disponíveis para seleção
 AVAILABLE_YEARS = [2021, 2022, 2023, 2024]
 
 
+# Colunas usadas pela barra lateral e pelos filtros (sempre carregadas)
+BASE_COLUMNS = ['date', 'region', 'val_cargaenergiamwmed', 'is_anomaly']
+
+# Colunas extras de cada tipo de análise (None = todas as colunas, para
+# análises com seleção livre de variáveis, modelo ML e export)
+ANALYSIS_COLUMNS = {
+    "Overview & KPIs": ['temp_mean'],
+    "Correlação": None,
+    "Scatter": None,
+    "Série temporal": None,
+    "Comparar regiões": None,
+    "Análise Temporal & Sazonal": [],
+    "Anomalias": ['temp_mean', 'load_zscore'],
+    "ML Predictions": None,
+    "Export & Reports": None,
+}
+
+
+def columns_for(analysis: str) -> Optional[tuple]:
+    """
+    Retorna as colunas a ler do Parquet para um tipo de análise.
+    """
+    extra = ANALYSIS_COLUMNS.get(analysis)
+    if extra is None:
+        return None
+    return tuple(BASE_COLUMNS + extra)
+
+
+@st.cache_resource(ttl=3600)
+def build_regions(years: tuple, columns: Optional[tuple] = None) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Carrega os anos selecionados e particiona as linhas por região.
+
+    O resultado fica em cache por seleção de anos/colunas, então cliques
+    em outros widgets não recarregam nem reparticionam os dados. Em vez de
+    um DataFrame por região, guarda só os índices das linhas de cada uma;
+    a fatia é materializada com `df.take` apenas quando usada.
+
+    Usa `st.cache_resource`: o DataFrame é compartilhado, sem ser
+    serializado e copiado a cada rerun. Ele é somente leitura — quem
+    precisar alterar colunas deve trabalhar sobre uma cópia.
+
+    Returns:
+        Tupla (df, índices das linhas por nome de região)
+    """
+    if len(years) == 1:
+        df = load_processed_data_single_year(years[0], columns)
+    else:
+        df = load_processed_data_multi_year(list(years), columns)
+
+    # Verifica se dados foram carregados
+    if df.empty:
+        st.error("❌ Nenhum dado disponível. Usando dados de 2023 como fallback.")
+        df = load_processed_data_single_year(2023, columns)
+
+    # Ordena por data: os índices de cada região são crescentes, então todas
+    # as fatias também ficam ordenadas (o filtro de período usa searchsorted)
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+
+    # Região já é categórica: as linhas são particionadas em uma única
+    # passada pelo groupby, em vez de uma máscara booleana por região
+    region_rows = df.groupby('region', sort=False, observed=True).indices
+
+    return df, {name: region_rows.get(name, np.empty(0, dtype=np.intp)) for name in REGION_NAMES}
+
+
+@st.cache_data(ttl=3600)
+def feature_count(years: tuple) -> Optional[int]:
+    """
+    Número de colunas dos dados processados, lido do schema do Parquet.
+
+    Não depende das colunas carregadas para a análise selecionada.
+
+    Returns:
+        Número de colunas, ou None se nenhum arquivo dos anos existir
+    """
+    paths = [Path(f"data/processed/energy_weather_{year}.parquet") for year in years]
+    paths.append(Path("data/processed/energy_weather_processed.parquet"))
+    for path in paths:
+        if path.exists():
+            return len(pq.read_schema(path).names)
+    return None
+
+
+@st.cache_data(ttl=3600)
+def sidebar_summary(years: tuple, columns: Optional[tuple], _df: pd.DataFrame) -> dict:
+    """
+    Calcula de uma vez todos os números exibidos na barra lateral.
+
+    `_df` não entra na chave do cache (o prefixo `_` evita o hash do
+    DataFrame): ele é determinado pela seleção de anos e colunas.
+
+    Returns:
+        Dicionário com total de registros, período, anomalias e carga
+        média por região
+    """
+    summary = {
+        'total_registros': len(_df),
+        'periodo_inicio': _df['date'].min().strftime('%d/%m/%Y'),
+        'periodo_fim': _df['date'].max().strftime('%d/%m/%Y'),
+        'total_anomalias': (
+            int(np.count_nonzero(_df['is_anomaly'].to_numpy())) if 'is_anomaly' in _df.columns else None
+        ),
+    }
+
+    # Carga média por região em um único groupby
+    summary['carga_media'] = (
+        _df.groupby('region', observed=True)['val_cargaenergiamwmed'].mean().to_dict()
+    )
+    return summary
+
+
+@st.cache_data(ttl=3600)
+def global_region_stats(years: tuple, columns: Optional[tuple], var: str, _df: pd.DataFrame) -> tuple:
+    """
+    Resumo por região de uma variável sobre o DataFrame completo.
+
+    Não depende da região nem do período filtrados, então fica em cache por
+    seleção de anos/colunas e variável (`_df` não entra no hash).
+    """
+    dashboard = importlib.import_module("src.dashboard")
+    return dashboard.resumo_regional(_df, var)
+
+
 # ============================================================================
 # INTERFACE PRINCIPAL (Estrutura do App Original)
 # ============================================================================
@@ -154,26 +373,13 @@ with st.sidebar:
     elif "2024" in year_option:
         selected_years = [2024]
 
+    # Lê apenas as colunas usadas pela análise selecionada (o valor do
+    # widget já está em session_state antes de ele ser renderizado)
+    columns = columns_for(st.session_state.get("tipo", next(iter(ANALYSIS_COLUMNS))))
+
     # Carrega dados baseado na seleção
     with st.spinner(f"Carregando dados de {len(selected_years)} ano(s)..."):
-        if len(selected_years) == 1:
-            df = load_processed_data_single_year(selected_years[0])
-        else:
-            df = load_processed_data_multi_year(selected_years)
-
-    # Verifica se dados foram carregados
-    if df.empty:
-        st.error("❌ Nenhum dado disponível. Usando dados de 2023 como fallback.")
-        df = load_processed_data_single_year(2023)
-
-# Prepara dicionário de regiões (como no app original)
-REGIONS = {
-    "Todas as Regiões": df,
-    "Sul": df[df['region'] == 'Sul'],
-    "Sudeste/Centro-Oeste": df[df['region'] == 'Sudeste/Centro-Oeste'],
-    "Nordeste": df[df['region'] == 'Nordeste'],
-    "Norte": df[df['region'] == 'Norte']
-}
+        df, region_rows = build_regions(tuple(selected_years), columns)
 
 # ============================================================================
 # SIDEBAR - MÉTRICAS E INFORMAÇÕES
@@ -183,19 +389,17 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### 📊 Resumo dos Dados")
 
-    # Métricas gerais
-    total_registros = len(df)
-    periodo_inicio = df['date'].min().strftime('%d/%m/%Y')
-    periodo_fim = df['date'].max().strftime('%d/%m/%Y')
+    resumo = sidebar_summary(tuple(selected_years), columns, df)
 
-    st.metric("Total de Registros", f"{total_registros:,}")
-    st.metric("Período", f"{periodo_inicio}")
-    st.caption(f"até {periodo_fim}")
+    # Métricas gerais
+    st.metric("Total de Registros", f"{resumo['total_registros']:,}")
+    st.metric("Período", f"{resumo['periodo_inicio']}")
+    st.caption(f"até {resumo['periodo_fim']}")
 
     # Anomalias
-    if 'is_anomaly' in df.columns:
-        total_anomalias = df['is_anomaly'].sum()
-        taxa_anomalias = (total_anomalias / len(df)) * 100
+    if resumo['total_anomalias'] is not None:
+        total_anomalias = resumo['total_anomalias']
+        taxa_anomalias = (total_anomalias / resumo['total_registros']) * 100
         st.metric(
             "Anomalias Detectadas",
             f"{total_anomalias}",
@@ -206,16 +410,16 @@ with st.sidebar:
     # Carga média por região
     st.markdown("---")
     st.markdown("### ⚡ Carga Média por Região")
-    for region_name, region_df in REGIONS.items():
-        if region_name != "Todas as Regiões" and len(region_df) > 0:
-            media_carga = region_df['val_cargaenergiamwmed'].mean()
-            st.caption(f"{region_name}: **{media_carga:,.0f} MW**")
+    for region_name in REGION_NAMES:
+        if region_name in resumo['carga_media']:
+            st.caption(f"{region_name}: **{resumo['carga_media'][region_name]:,.0f} MW**")
 
     # Info adicional
     st.markdown("---")
     st.markdown("### ℹ️ Sobre")
-    st.caption(f"**Features:** {len(df.columns)} disponíveis")
-    st.caption(f"**Regiões:** {len(REGIONS) - 1} + Todas")
+    n_features = feature_count(tuple(selected_years))
+    st.caption(f"**Features:** {n_features if n_features is not None else len(df.columns)} disponíveis")
+    st.caption(f"**Regiões:** {len(REGION_NAMES)} + Todas")
     st.caption(f"**Análises:** 9 tipos")
 
     # Footer
@@ -227,8 +431,8 @@ with st.sidebar:
 # ============================================================================
 
 # Selectbox de região (como no app original)
-regiao = st.selectbox("🗺️ Região", list(REGIONS.keys()))
-df_filtrado = REGIONS[regiao]
+regiao = st.selectbox("🗺️ Região", ["Todas as Regiões"] + REGION_NAMES)
+df_filtrado = df if regiao == "Todas as Regiões" else df.take(region_rows[regiao])
 
 # Filtro temporal interativo (opcional)
 col1, col2 = st.columns([2, 1])
@@ -237,17 +441,8 @@ with col1:
     # Selectbox de tipo de análise (expandido do original)
     tipo = st.selectbox(
         "📊 Escolha o tipo de análise",
-        [
-            "Overview & KPIs",
-            "Correlação",
-            "Scatter",
-            "Série temporal",
-            "Comparar regiões",
-            "Análise Temporal & Sazonal",
-            "Anomalias",
-            "ML Predictions",
-            "Export & Reports"
-        ]
+        list(ANALYSIS_COLUMNS.keys()),
+        key="tipo"
     )
 
 with col2:
@@ -256,7 +451,6 @@ with col2:
 
 # Aplicar filtro temporal se ativado
 if usar_filtro:
-    df_filtrado['date'] = pd.to_datetime(df_filtrado['date'])
     data_min = df_filtrado['date'].min().date()
     data_max = df_filtrado['date'].max().date()
 
@@ -278,11 +472,12 @@ if usar_filtro:
             help="Selecione a data final do período"
         )
 
-    # Aplicar filtro
-    df_filtrado = df_filtrado[
-        (df_filtrado['date'].dt.date >= data_inicio) &
-        (df_filtrado['date'].dt.date <= data_fim)
-    ]
+    # Aplicar filtro: as datas estão ordenadas, então o período é uma fatia
+    # contígua encontrada por busca binária (sem máscaras booleanas)
+    datas = df_filtrado['date'].to_numpy()
+    inicio = datas.searchsorted(np.datetime64(data_inicio), side='left')
+    fim = datas.searchsorted(np.datetime64(data_fim) + np.timedelta64(1, 'D'), side='left')
+    df_filtrado = df_filtrado.iloc[inicio:fim]
 
     # Mostrar info sobre filtro aplicado
     st.info(f"📅 Filtro ativo: {len(df_filtrado):,} registros entre {data_inicio.strftime('%d/%m/%Y')} e {data_fim.strftime('%d/%m/%Y')}")
@@ -293,6 +488,10 @@ st.markdown("---")
 # RENDERIZAÇÃO (Baseado na estrutura original)
 # ============================================================================
 
+# Funções do dashboard importadas só na renderização: barra lateral e
+# filtros aparecem antes do import do plotly e dos componentes de gráfico
+dashboard = importlib.import_module("src.dashboard")
+
 # Mantém a estrutura if/elif do app original
 if tipo == "Overview & KPIs":
     dashboard.overview(df_filtrado)
@@ -307,7 +506,10 @@ elif tipo == "Série temporal":
     dashboard.serie(df_filtrado)
 
 elif tipo == "Comparar regiões":
-    dashboard.comparar(df_filtrado, df)
+    dashboard.comparar(
+        df_filtrado,
+        lambda var: global_region_stats(tuple(selected_years), columns, var, df)
+    )
 
 elif tipo == "Análise Temporal & Sazonal":
     dashboard.temporal(df_filtrado)
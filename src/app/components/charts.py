@@ -8,7 +8,8 @@ energy analytics and time series data visualization.
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from typing import Optional, List
+import numpy as np
+from typing import Dict, Optional, List
 
 
 # Professional color palette
@@ -28,6 +29,60 @@ REGION_COLORS = {
     'Sul': '#f39c12',
 }
 
+# Traces with more points than this are drawn with WebGL (Scattergl)
+SCATTERGL_MIN_ROWS = 1000
+
+# Line series longer than this are decimated to their min/max envelope
+MAX_LINE_POINTS = 2000
+
+# Correlation heatmaps with more variables than this skip per-cell labels
+HEATMAP_TEXT_MAX_VARS = 10
+
+# Southern Hemisphere seasons and the season code of each month (index 1-12)
+SEASON_ORDER = ['Summer', 'Fall', 'Winter', 'Spring']
+SEASON_CODE_BY_MONTH = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+
+def _scatter_trace(n_points: int):
+    """Return the Scatter class for a trace: WebGL above SCATTERGL_MIN_ROWS points."""
+    return go.Scattergl if n_points > SCATTERGL_MIN_ROWS else go.Scatter
+
+
+def _minmax_decimate(series: List[np.ndarray], max_points: int = MAX_LINE_POINTS) -> Optional[np.ndarray]:
+    """
+    Row positions that keep the visual envelope of long line series.
+
+    Rows are split into max_points / 2 contiguous buckets and the minimum
+    and maximum of each series are kept per bucket (plus the first and last
+    row), so peaks and dips survive while the payload stays bounded by the
+    chart width instead of the number of rows.
+
+    Args:
+        series: Value arrays of equal length sharing the same x-axis
+        max_points: Target number of points per series
+
+    Returns:
+        Sorted row positions to plot, or None when no decimation is needed
+    """
+    n = len(series[0])
+    if n <= max_points:
+        return None
+
+    n_buckets = max(max_points // 2, 1)
+    starts = np.linspace(0, n, n_buckets + 1).astype(np.intp)[:-1]
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.r_[starts, n]))
+
+    keep = [np.array([0, n - 1])]
+    for values in series:
+        values = np.asarray(values, dtype=np.float64)
+        for reduce in (np.fmin, np.fmax):
+            extreme = reduce.reduceat(values, starts)
+            hits = np.flatnonzero(values == extreme[bucket])
+            # First hit of each bucket
+            _, first = np.unique(bucket[hits], return_index=True)
+            keep.append(hits[first])
+    return np.unique(np.concatenate(keep))
+
 
 def create_dual_axis_chart(
     df: pd.DataFrame,
@@ -67,19 +122,34 @@ def create_dual_axis_chart(
     """
     fig = go.Figure()
 
+    x = df[x_col].to_numpy()
+    y1 = df[y1_col].to_numpy(dtype=np.float32)
+    y2 = df[y2_col].to_numpy(dtype=np.float32)
+
+    # Long series are reduced to their min/max envelope before plotting
+    rows = _minmax_decimate([y1, y2])
+    if rows is not None:
+        x, y1, y2 = x[rows], y1[rows], y2[rows]
+
+    # NumPy arrays are sent as typed arrays (both traces share the same x
+    # array); large series render with WebGL
+    scatter = _scatter_trace(len(x))
+
     # Left axis (y1)
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y1_col],
+    fig.add_trace(scatter(
+        x=x,
+        y=y1,
+        mode='lines',
         name=y1_label,
         line=dict(color=COLORS['primary'], width=2),
         yaxis='y1'
     ))
 
     # Right axis (y2)
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y2_col],
+    fig.add_trace(scatter(
+        x=x,
+        y=y2,
+        mode='lines',
         name=y2_label,
         line=dict(color=COLORS['danger'], width=2),
         yaxis='y2'
@@ -115,7 +185,9 @@ def create_time_series_with_bands(
     std_col: Optional[str] = None,
     title: str = "Time Series with Confidence Bands",
     y_label: str = "Value",
-    height: int = 500
+    height: int = 500,
+    mean_val: Optional[float] = None,
+    std_val: Optional[float] = None
 ) -> go.Figure:
     """
     Create time series with confidence bands (±1σ, ±2σ).
@@ -129,6 +201,10 @@ def create_time_series_with_bands(
         title: Chart title
         y_label: Y-axis label
         height: Chart height
+        mean_val: Precomputed mean of y_col (e.g. cached KPI statistics);
+                  takes precedence over mean_col
+        std_val: Precomputed standard deviation of y_col; takes precedence
+                 over std_col
 
     Returns:
         Plotly Figure
@@ -144,69 +220,56 @@ def create_time_series_with_bands(
     fig = go.Figure()
 
     # Calculate mean and std if not provided
-    if mean_col is None:
+    if mean_val is not None:
+        mean = mean_val
+    elif mean_col is None:
         mean = df[y_col].mean()
     else:
         mean = df[mean_col].mean()
 
-    if std_col is None:
+    if std_val is not None:
+        std = std_val
+    elif std_col is None:
         std = df[y_col].std()
     else:
         std = df[std_col].mean()
 
-    # ±2σ band (lighter)
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=[mean + 2*std] * len(df),
-        fill=None,
-        mode='lines',
-        line=dict(color='rgba(0,0,0,0)'),
-        showlegend=False
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=[mean - 2*std] * len(df),
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='rgba(0,0,0,0)'),
-        fillcolor='rgba(68, 68, 68, 0.1)',
-        name='±2σ'
-    ))
-
-    # ±1σ band (darker)
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=[mean + std] * len(df),
-        fill=None,
-        mode='lines',
-        line=dict(color='rgba(0,0,0,0)'),
-        showlegend=False
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=[mean - std] * len(df),
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='rgba(0,0,0,0)'),
-        fillcolor='rgba(68, 68, 68, 0.2)',
-        name='±1σ'
-    ))
+    # Bands and mean are constant: draw them as layout shapes (a few
+    # numbers in the payload) instead of data traces
+    fig.add_hrect(
+        y0=mean - 2*std, y1=mean + 2*std,
+        fillcolor='rgba(68, 68, 68, 0.1)', line_width=0, layer='below'
+    )
+    fig.add_hrect(
+        y0=mean - std, y1=mean + std,
+        fillcolor='rgba(68, 68, 68, 0.2)', line_width=0, layer='below'
+    )
+    fig.add_hline(y=mean, line=dict(color='gray', dash='dash'))
 
-    # Mean line
+    # Legend-only entries for the shapes
+    for name, color in [('±2σ', 'rgba(68, 68, 68, 0.1)'), ('±1σ', 'rgba(68, 68, 68, 0.2)')]:
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None],
+            mode='markers',
+            marker=dict(symbol='square', size=12, color=color),
+            name=name
+        ))
     fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=[mean] * len(df),
+        x=[None], y=[None],
         mode='lines',
         line=dict(color='gray', dash='dash'),
         name='Mean'
     ))
 
-    # Actual data
-    fig.add_trace(go.Scatter(
-        x=df[x_col],
-        y=df[y_col],
+    # Actual data (bands above use every row; the line is decimated)
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy(dtype=np.float32)
+    rows = _minmax_decimate([y])
+    if rows is not None:
+        x, y = x[rows], y[rows]
+    fig.add_trace(_scatter_trace(len(x))(
+        x=x,
+        y=y,
         mode='lines',
         line=dict(color=COLORS['primary'], width=2),
         name=y_label
@@ -229,7 +292,9 @@ def create_regional_comparison(
     region_col: str,
     value_col: str,
     title: str = "Regional Comparison",
-    chart_type: str = "bar"
+    chart_type: str = "bar",
+    region_values: Optional[Dict[str, np.ndarray]] = None,
+    region_means: Optional[pd.Series] = None
 ) -> go.Figure:
     """
     Create regional comparison chart (bar or box plot).
@@ -240,6 +305,10 @@ def create_regional_comparison(
         value_col: Column with values to compare
         title: Chart title
         chart_type: 'bar' or 'box'
+        region_values: Precomputed {region: values} for the box plot
+                       (e.g. cached by the caller); grouped from df if None
+        region_means: Precomputed mean per region (Series indexed by region)
+                      for the bar chart; grouped from df if None
 
     Returns:
         Plotly Figure
@@ -253,25 +322,32 @@ def create_regional_comparison(
         ... )
     """
     if chart_type == "bar":
-        # Calculate mean by region
-        regional_mean = df.groupby(region_col)[value_col].mean().reset_index()
-        regional_mean = regional_mean.sort_values(value_col, ascending=False)
+        # Calculate mean by region (unless provided by the caller)
+        if region_means is None:
+            region_means = df.groupby(region_col, observed=True, sort=False)[value_col].mean()
+        region_means = region_means.sort_values(ascending=False)
+        regions = region_means.index.tolist()
+        means = region_means.to_numpy()
 
         fig = go.Figure(data=[
             go.Bar(
-                x=regional_mean[region_col],
-                y=regional_mean[value_col],
-                marker_color=[REGION_COLORS.get(r, COLORS['primary'])
-                             for r in regional_mean[region_col]],
-                text=regional_mean[value_col].round(1),
+                x=regions,
+                y=means,
+                marker_color=[REGION_COLORS.get(r, COLORS['primary']) for r in regions],
+                text=means.round(1),
                 textposition='outside'
             )
         ])
 
     else:  # box plot
         fig = go.Figure()
-        for region in df[region_col].unique():
-            region_data = df[df[region_col] == region][value_col]
+        # One hashed partition instead of an equality scan per region
+        if region_values is None:
+            region_values = {
+                region: values.to_numpy()
+                for region, values in df.groupby(region_col, sort=False, observed=True)[value_col]
+            }
+        for region, region_data in region_values.items():
             fig.add_trace(go.Box(
                 y=region_data,
                 name=region,
@@ -289,10 +365,43 @@ def create_regional_comparison(
     return fig
 
 
+def correlation_matrix(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Pearson correlation matrix computed as one float32 matrix product.
+
+    Columns are standardized in a contiguous float32 array and correlated
+    with a single BLAS ``X.T @ X``. Data with missing values falls back to
+    ``DataFrame.corr`` (pairwise-complete observations).
+
+    Args:
+        df: DataFrame
+        columns: Columns to correlate (None = all numeric)
+
+    Returns:
+        Square correlation DataFrame indexed by column name
+
+    Example:
+        >>> corr_df = correlation_matrix(data, ['val_cargaenergiamwmed', 'temp_mean'])
+    """
+    num_df = df.select_dtypes(include='number') if columns is None else df[columns]
+    X = num_df.to_numpy(dtype=np.float32)
+    if len(X) < 2 or np.isnan(X).any():
+        return num_df.corr()
+
+    X = X - X.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        X /= np.sqrt((X * X).sum(axis=0))
+        corr = X.T @ X
+    np.clip(corr, -1.0, 1.0, out=corr)
+
+    return pd.DataFrame(corr.astype(np.float64), index=num_df.columns, columns=num_df.columns)
+
+
 def create_correlation_heatmap(
     df: pd.DataFrame,
     columns: Optional[List[str]] = None,
-    title: str = "Correlation Heatmap"
+    title: str = "Correlation Heatmap",
+    precomputed_corr: Optional[pd.DataFrame] = None
 ) -> go.Figure:
     """
     Create correlation heatmap for numerical columns.
@@ -301,6 +410,8 @@ def create_correlation_heatmap(
         df: DataFrame
         columns: List of columns to include (None = all numeric)
         title: Chart title
+        precomputed_corr: Correlation matrix already computed by the caller
+                          (e.g. cached); computed from df if None
 
     Returns:
         Plotly Figure
@@ -311,21 +422,24 @@ def create_correlation_heatmap(
         ...     columns=['val_cargaenergiamwmed', 'temp_mean', 'radiation_mean']
         ... )
     """
-    if columns is None:
-        corr_df = df.select_dtypes(include='number').corr()
+    corr_df = precomputed_corr if precomputed_corr is not None else correlation_matrix(df, columns)
+    z = corr_df.to_numpy(dtype=np.float32)
+
+    # Per-cell labels are K² text nodes in the browser; past
+    # HEATMAP_TEXT_MAX_VARS variables the values are shown on hover only
+    if len(corr_df.columns) <= HEATMAP_TEXT_MAX_VARS:
+        cell_text = dict(text=z.round(2), texttemplate='%{text}', textfont={"size": 10})
     else:
-        corr_df = df[columns].corr()
+        cell_text = dict(hovertemplate='%{y} × %{x}: %{z:.2f}<extra></extra>')
 
     fig = go.Figure(data=go.Heatmap(
-        z=corr_df.values,
-        x=corr_df.columns,
-        y=corr_df.columns,
+        z=z,
+        x=list(corr_df.columns),
+        y=list(corr_df.columns),
         colorscale='RdBu',
         zmid=0,
-        text=corr_df.values.round(2),
-        texttemplate='%{text}',
-        textfont={"size": 10},
-        colorbar=dict(title="Correlation")
+        colorbar=dict(title="Correlation"),
+        **cell_text
     ))
 
     fig.update_layout(
@@ -359,23 +473,26 @@ def create_anomaly_scatter(
     Returns:
         Plotly Figure
     """
-    # Normal points
-    normal = df[df[anomaly_col] == 0]
-    anomalies = df[df[anomaly_col] == 1]
+    # Split points with a single mask over NumPy arrays (no DataFrame copies)
+    is_anomaly = df[anomaly_col].to_numpy() == 1
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy(dtype=np.float32)
 
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
-        x=normal[x_col],
-        y=normal[y_col],
+    # Normal points (the bulk of the data) are drawn with WebGL; the few
+    # anomalies keep SVG markers for the 'x' symbol
+    fig.add_trace(go.Scattergl(
+        x=x[~is_anomaly],
+        y=y[~is_anomaly],
         mode='markers',
         name='Normal',
         marker=dict(color=COLORS['primary'], size=6, opacity=0.6)
     ))
 
     fig.add_trace(go.Scatter(
-        x=anomalies[x_col],
-        y=anomalies[y_col],
+        x=x[is_anomaly],
+        y=y[is_anomaly],
         mode='markers',
         name='Anomaly',
         marker=dict(
@@ -405,7 +522,8 @@ def create_time_series_with_moving_avg(
     windows: List[int] = [7, 30],
     title: str = "Time Series with Moving Averages",
     y_label: str = "Value",
-    height: int = 500
+    height: int = 500,
+    moving_averages: Optional[Dict[int, np.ndarray]] = None
 ) -> go.Figure:
     """
     Create time series with multiple moving averages.
@@ -418,6 +536,8 @@ def create_time_series_with_moving_avg(
         title: Chart title
         y_label: Y-axis label
         height: Chart height
+        moving_averages: Precomputed moving averages keyed by window size
+                         (e.g. cached by the caller); computed here if None
 
     Returns:
         Plotly Figure
@@ -446,7 +566,10 @@ def create_time_series_with_moving_avg(
     # Moving averages
     colors = [COLORS['warning'], COLORS['danger'], COLORS['success']]
     for i, window in enumerate(windows):
-        ma = df[y_col].rolling(window=window, center=False).mean()
+        if moving_averages is not None and window in moving_averages:
+            ma = moving_averages[window]
+        else:
+            ma = df[y_col].rolling(window=window, center=False).mean()
         fig.add_trace(go.Scatter(
             x=df[x_col],
             y=ma,
@@ -501,35 +624,12 @@ def create_seasonal_analysis(
         ...     value_col='val_cargaenergiamwmed'
         ... )
     """
-    # Add season column
-    df_copy = df.copy()
-    df_copy[date_col] = pd.to_datetime(df_copy[date_col])
-    df_copy['month'] = df_copy[date_col].dt.month
-
-    # Define seasons (Southern Hemisphere)
-    def get_season(month):
-        if month in [12, 1, 2]:
-            return 'Summer'
-        elif month in [3, 4, 5]:
-            return 'Fall'
-        elif month in [6, 7, 8]:
-            return 'Winter'
-        else:
-            return 'Spring'
-
-    df_copy['season'] = df_copy['month'].apply(get_season)
-
-    # Calculate statistics by season
-    seasonal_stats = df_copy.groupby('season')[value_col].agg(['mean', 'std']).reset_index()
-
-    # Order seasons
-    season_order = ['Summer', 'Fall', 'Winter', 'Spring']
-    seasonal_stats['season'] = pd.Categorical(
-        seasonal_stats['season'],
-        categories=season_order,
-        ordered=True
+    # Map month -> season code with a lookup table (Southern Hemisphere)
+    months = pd.DatetimeIndex(df[date_col]).month.to_numpy()
+    seasons = pd.Series(
+        pd.Categorical.from_codes(np.take(SEASON_CODE_BY_MONTH, months), categories=SEASON_ORDER),
+        index=df.index
     )
-    seasonal_stats = seasonal_stats.sort_values('season')
 
     # Create box plot by season
     fig = go.Figure()
@@ -541,8 +641,8 @@ def create_seasonal_analysis(
         'Spring': '#2ecc71'
     }
 
-    for season in season_order:
-        season_data = df_copy[df_copy['season'] == season][value_col]
+    # One partition on the season codes (all seasons kept, in SEASON_ORDER)
+    for season, season_data in df[value_col].groupby(seasons, observed=False):
         fig.add_trace(go.Box(
             y=season_data,
             name=season,
@@ -587,26 +687,29 @@ def create_monthly_heatmap(
         ...     value_col='val_cargaenergiamwmed'
         ... )
     """
-    df_copy = df.copy()
-    df_copy[date_col] = pd.to_datetime(df_copy[date_col])
-    df_copy['month'] = df_copy[date_col].dt.month
-    df_copy['day'] = df_copy[date_col].dt.day
-
-    # Create pivot table
-    heatmap_data = df_copy.pivot_table(
-        values=value_col,
-        index='day',
-        columns='month',
-        aggfunc='mean'
-    )
+    # Flat (day, month) cell index of each row in a fixed 31 x 12 grid
+    dates = pd.DatetimeIndex(df[date_col])
+    cells = (dates.day.to_numpy() - 1) * 12 + (dates.month.to_numpy() - 1)
+    values = df[value_col].to_numpy(dtype=np.float64)
+
+    # Accumulate sums and counts per cell (NaN values skipped, like mean())
+    valid = ~np.isnan(values)
+    sums = np.bincount(cells[valid], weights=values[valid], minlength=31 * 12).reshape(31, 12)
+    counts = np.bincount(cells[valid], minlength=31 * 12).reshape(31, 12)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+
+    # Keep days present in the data and months with at least one value
+    day_rows = np.bincount(cells, minlength=31 * 12).reshape(31, 12).any(axis=1)
+    month_cols = counts.any(axis=0)
 
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
     fig = go.Figure(data=go.Heatmap(
-        z=heatmap_data.values,
-        x=[month_names[i-1] for i in heatmap_data.columns],
-        y=heatmap_data.index,
+        z=means[day_rows][:, month_cols],
+        x=[name for name, keep in zip(month_names, month_cols) if keep],
+        y=np.flatnonzero(day_rows) + 1,
         colorscale='RdYlBu_r',
         colorbar=dict(title=value_col.replace('_', ' ').title()),
         hovertemplate='Month: %{x}<br>Day: %{y}<br>Value: %{z:.1f}<extra></extra>'
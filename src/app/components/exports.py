@@ -0,0 +1,70 @@
+"""
+File export helpers for the dashboard.
+
+Builds the downloadable Excel workbook (data sheet plus a summary sheet)
+independently of Streamlit, so the same bytes can be checked outside the
+app (see scripts/test_excel_export.py).
+"""
+
+from io import BytesIO
+import pandas as pd
+
+
+def _check_xlsxwriter():
+    """Check if XlsxWriter is available for Excel exports."""
+    try:
+        import xlsxwriter  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+XLSXWRITER_AVAILABLE = _check_xlsxwriter()
+
+
+def export_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summary sheet of an export: record count, period, regions, load, anomalies.
+
+    Args:
+        df: Exported DataFrame (any subset of the processed columns)
+
+    Returns:
+        DataFrame with 'Metric' and 'Value' columns
+    """
+    return pd.DataFrame({
+        'Metric': ['Total Records', 'Date Range', 'Regions', 'Avg Load (MW)', 'Anomalies'],
+        'Value': [
+            len(df),
+            f"{df['date'].min()} to {df['date'].max()}" if 'date' in df else 'N/A',
+            df['region'].nunique() if 'region' in df else 'N/A',
+            f"{df['val_cargaenergiamwmed'].mean():.2f}" if 'val_cargaenergiamwmed' in df else 'N/A',
+            df['is_anomaly'].sum() if 'is_anomaly' in df else 'N/A'
+        ]
+    })
+
+
+def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Write a DataFrame and its summary to an in-memory Excel workbook.
+
+    Uses XlsxWriter when it is installed (faster than building openpyxl
+    cell objects), openpyxl otherwise. XlsxWriter's constant_memory mode
+    is not used: pandas writes cells column by column, and that mode
+    silently drops cells that are not written in row order.
+
+    Args:
+        df: DataFrame to export (written to the 'Data' sheet)
+
+    Returns:
+        Contents of the .xlsx file
+
+    Example:
+        >>> data = to_excel_bytes(df[['date', 'region', 'val_cargaenergiamwmed']])
+    """
+    buffer = BytesIO()
+    engine = 'xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl'
+    with pd.ExcelWriter(buffer, engine=engine) as writer:
+        df.to_excel(writer, sheet_name='Data', index=False)
+        export_summary(df).to_excel(writer, sheet_name='Summary', index=False)
+    return buffer.getvalue()
@@ -6,7 +6,27 @@ following best practices for data visualization.
 """
 
 import streamlit as st
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
+
+
+def _format_kpi(
+    value: Union[int, float],
+    delta: Optional[Union[int, float]] = None,
+    delta_label: Optional[str] = None,
+    format_str: str = "{:,.2f}"
+) -> Tuple[str, Optional[str]]:
+    """Format a KPI value and its delta text (None when there is no delta)."""
+    formatted_value = format_str.format(value)
+
+    if delta is not None:
+        delta_pct = (delta / value) * 100 if value != 0 else 0
+        delta_text = f"{delta:+.1f} ({delta_pct:+.1f}%)"
+        if delta_label:
+            delta_text += f" {delta_label}"
+    else:
+        delta_text = None
+
+    return formatted_value, delta_text
 
 
 def display_kpi_card(
@@ -37,15 +57,7 @@ def display_kpi_card(
         ...     format_str="{:,.1f} MW"
         ... )
     """
-    formatted_value = format_str.format(value)
-
-    if delta is not None:
-        delta_pct = (delta / value) * 100 if value != 0 else 0
-        delta_text = f"{delta:+.1f} ({delta_pct:+.1f}%)"
-        if delta_label:
-            delta_text += f" {delta_label}"
-    else:
-        delta_text = None
+    formatted_value, delta_text = _format_kpi(value, delta, delta_label, format_str)
 
     st.metric(
         label=label,
@@ -70,17 +82,18 @@ def display_kpi_row(metrics: list[dict]) -> None:
         ... ]
         >>> display_kpi_row(metrics)
     """
-    cols = st.columns(len(metrics))
+    # Format everything first, then write each card straight into its column
+    rendered = [
+        (metric['label'],
+         *_format_kpi(metric['value'], metric.get('delta'),
+                      format_str=metric.get('format', '{:,.2f}')),
+         metric.get('help'))
+        for metric in metrics
+    ]
 
-    for col, metric in zip(cols, metrics):
-        with col:
-            display_kpi_card(
-                label=metric['label'],
-                value=metric['value'],
-                delta=metric.get('delta'),
-                format_str=metric.get('format', '{:,.2f}'),
-                help_text=metric.get('help')
-            )
+    cols = st.columns(len(rendered))
+    for col, (label, value, delta, help_text) in zip(cols, rendered):
+        col.metric(label=label, value=value, delta=delta, help=help_text)
 
 
 def display_stat_summary(
@@ -112,17 +125,22 @@ def display_stat_summary(
         ...     unit="MW"
         ... )
     """
-    with st.expander(f"📊 {title}"):
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric("Mean", f"{mean:,.1f} {unit}")
-            st.metric("Std Dev", f"{std:,.1f} {unit}")
-
-        with col2:
-            st.metric("Median", f"{median:,.1f} {unit}")
-            st.metric("Range", f"{max_val - min_val:,.1f} {unit}")
+    # Same 3-column layout as before (row-major), sent as a single element
+    # instead of six st.metric widgets
+    stats = [
+        ("Mean", mean), ("Median", median), ("Min", min_val),
+        ("Std Dev", std), ("Range", max_val - min_val), ("Max", max_val),
+    ]
+    cards = "".join(
+        f"<div class='metric-card' style='padding: 1rem;'>"
+        f"<div style='font-size: 0.875rem; color: #64748b;'>{label}</div>"
+        f"<div style='font-size: 1.75rem; font-weight: 600;'>{value:,.1f} {unit}</div>"
+        f"</div>"
+        for label, value in stats
+    )
 
-        with col3:
-            st.metric("Min", f"{min_val:,.1f} {unit}")
-            st.metric("Max", f"{max_val:,.1f} {unit}")
+    with st.expander(f"📊 {title}"):
+        st.markdown(
+            f"<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;'>{cards}</div>",
+            unsafe_allow_html=True
+        )
@@ -11,14 +11,22 @@ Run with:
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
 from pathlib import Path
+from typing import Callable
 
 # Import pipeline components
 from src.data.loaders import ONSLoader, INMETLoader
 from src.data.preprocessor import Preprocessor
+from src.data.storage import (
+    DICTIONARY_COLUMNS, MEASURED_COLUMNS, downcast_numeric,
+    read_processed_feather, read_processed_table
+)
 
 # Import dashboard components
-from src.app.components import metrics, charts
+from src.app.components import metrics, charts, exports
+from src.app.theme import apply_theme
 
 # Import ML model
 from src.models.anomaly_detector import AnomalyDetector
@@ -40,235 +48,348 @@ st.set_page_config(
 # CUSTOM CSS - PROFESSIONAL STYLING
 # ============================================================================
 
-st.markdown("""
-    <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+apply_theme()
 
-    /* Global Styles */
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif;
-    }
 
-    /* Main container background */
-    .main {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
+# ============================================================================
+# DATA LOADING (with caching)
+# ============================================================================
 
-    /* Header Styles */
-    .main-header {
-        font-size: 3.5rem;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem;
-        letter-spacing: -0.02em;
-    }
+# Region as a fixed categorical: int8 codes for filters and groupbys
+REGIONS = ['Norte', 'Nordeste', 'Sudeste/Centro-Oeste', 'Sul']
+REGION_DTYPE = pd.CategoricalDtype(REGIONS)
 
-    .sub-header {
-        font-size: 1.25rem;
-        color: #64748b;
-        font-weight: 400;
-        margin-bottom: 2rem;
-    }
 
-    /* Metric Cards */
-    .metric-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%);
-        padding: 1.5rem;
-        border-radius: 1rem;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1),
-                    0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        border: 1px solid rgba(148, 163, 184, 0.1);
-        transition: all 0.3s ease;
-    }
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compact dtypes and date order for the loaded data.
 
-    .metric-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.1),
-                    0 10px 10px -5px rgba(0, 0, 0, 0.04);
-    }
+    Args:
+        df: Processed DataFrame (from cache or pipeline)
 
-    /* Sidebar Styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1e293b 0%, #0f172a 100%);
-    }
+    Returns:
+        DataFrame sorted by date, with downcast numerics and categorical region
+    """
+    # float32/int8 columns halve the bytes every chart and statistic reads;
+    # the measured load stays float64 for the tables and exports
+    df = downcast_numeric(df, exclude=MEASURED_COLUMNS)
+    df['region'] = df['region'].astype(REGION_DTYPE)
+    # Sorted dates let the date filter slice with searchsorted
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+    return df
 
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] p,
-    [data-testid="stSidebar"] label,
-    [data-testid="stSidebar"] .st-emotion-cache-16idsys p {
-        color: #e2e8f0 !important;
-    }
 
-    [data-testid="stSidebar"] h3 {
-        color: #f1f5f9 !important;
-        font-weight: 600;
-    }
+@st.cache_data(ttl=3600, max_entries=4, show_spinner="Loading energy data…")  # Cache for 1 hour
+def load_processed_data(year: int = 2023) -> pd.DataFrame:
+    """
+    Load and process data using the robust pipeline.
 
-    /* Tab Styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: transparent;
-    }
+    This function leverages the production-ready ONSLoader, INMETLoader,
+    and Preprocessor to provide clean, feature-engineered data.
 
-    .stTabs [data-baseweb="tab"] {
-        background-color: #ffffff;
-        border-radius: 0.5rem 0.5rem 0 0;
-        padding: 12px 24px;
-        font-weight: 500;
-        border: 1px solid #e2e8f0;
-        border-bottom: none;
-        transition: all 0.2s ease;
-    }
+    Args:
+        year: Year to load (default 2023)
 
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: #f8fafc;
-    }
+    Returns:
+        Processed DataFrame with 19 features
+    """
+    # Try to load from the cached Arrow IPC file, then Parquet
+    feather_path = Path("data/processed/energy_weather_processed.feather")
+    cache_path = Path("data/processed/energy_weather_processed.parquet")
 
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white !important;
-        border-color: transparent;
-    }
+    # The Feather copy is only used while it is at least as new as the
+    # Parquet file (scripts may rewrite the Parquet file on their own)
+    feather_fresh = feather_path.exists() and (
+        not cache_path.exists()
+        or feather_path.stat().st_mtime_ns >= cache_path.stat().st_mtime_ns
+    )
 
-    /* Chart Container */
-    .element-container iframe {
-        border-radius: 0.75rem;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
+    if feather_fresh or cache_path.exists():
+        if feather_fresh:
+            st.info("📦 Loading from cache (Arrow)...")
+            table = read_processed_feather(feather_path)
+        else:
+            st.info("📦 Loading from cache (Parquet)...")
+            table = read_processed_table(cache_path, read_dictionary=DICTIONARY_COLUMNS)
+        # Text columns stay dictionary encoded (-> categoricals) and Arrow
+        # buffers are released column by column during the conversion
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+        return prepare_frame(df)
 
-    /* Section Dividers */
-    hr {
-        margin: 2rem 0;
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg,
-            transparent 0%,
-            rgba(148, 163, 184, 0.3) 50%,
-            transparent 100%);
-    }
+    # If no cache, run full pipeline
+    st.info("🔄 Running data pipeline... This may take a few minutes.")
 
-    /* DataFrames */
-    .stDataFrame {
-        border-radius: 0.75rem;
-        overflow: hidden;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
+    with st.spinner("Loading ONS energy data..."):
+        ons_loader = ONSLoader()
+        ons_df = ons_loader.load(year)
 
-    /* Buttons */
-    .stButton > button {
-        border-radius: 0.5rem;
-        font-weight: 500;
-        padding: 0.5rem 1.5rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border: none;
-        color: white;
-        transition: all 0.3s ease;
-    }
+    with st.spinner("Loading INMET weather data (567 stations)..."):
+        inmet_loader = INMETLoader()
+        inmet_df = inmet_loader.load(year)
 
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
-    }
+    with st.spinner("Processing and merging data..."):
+        preprocessor = Preprocessor()
+        df = preprocessor.process(ons_df, inmet_df, save=True)
 
-    /* Selectbox & Input Styling */
-    .stSelectbox > div > div,
-    .stMultiSelect > div > div,
-    .stDateInput > div > div {
-        border-radius: 0.5rem;
-        border-color: rgba(148, 163, 184, 0.3);
-    }
+    st.success("✅ Data loaded successfully!")
+    return prepare_frame(df)
 
-    /* Info/Warning/Success boxes */
-    .stAlert {
-        border-radius: 0.75rem;
-        border: none;
-    }
 
-    /* Expander */
-    .streamlit-expanderHeader {
-        background-color: #f8fafc;
-        border-radius: 0.5rem;
-        font-weight: 500;
-    }
+@st.cache_resource(ttl=3600, max_entries=10, show_spinner=False)
+def load_region_data(year: int, region: str = 'All') -> pd.DataFrame:
+    """
+    Processed data of one year, already filtered to a region.
 
-    /* Footer */
-    .footer {
-        text-align: center;
-        padding: 2rem 0;
-        color: #64748b;
-        font-size: 0.875rem;
-    }
+    Each (year, region) slice is built once and shared read-only across
+    reruns and sessions, so changing other widgets does not re-mask and
+    copy the full-year frame.
+
+    Args:
+        year: Year to load
+        region: Region name, or 'All' for every region
+
+    Returns:
+        Processed DataFrame for the selected region (do not modify in place)
+    """
+    df = load_processed_data(year)
+    if region != 'All':
+        # Compare int8 category codes instead of strings
+        region_code = REGION_DTYPE.categories.get_loc(region)
+        df = df[df['region'].cat.codes.to_numpy() == region_code].reset_index(drop=True)
+    return df
 
-    /* Spacing improvements */
-    .block-container {
-        padding-top: 3rem;
-        padding-bottom: 3rem;
-    }
 
-    /* Section headers */
-    h3 {
-        color: #1e293b;
-        font-weight: 600;
-        margin-top: 1.5rem;
-        margin-bottom: 1rem;
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def compute_kpi_stats(filter_key: tuple, _df: pd.DataFrame) -> dict:
+    """
+    Compute the KPI row and load statistics in one cached pass.
+
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
+
+    Returns:
+        Dictionary of scalar statistics, plus the row positions of the
+        top 10 anomalies by Z-score ('top_anomalies')
+    """
+    load = _df['val_cargaenergiamwmed']
+    is_anomaly = _df['is_anomaly'].to_numpy() == 1
+    anomaly_count = np.count_nonzero(is_anomaly)
+    return {
+        'load_mean': load.mean(),
+        'load_median': load.median(),
+        'load_std': load.std(),
+        'load_min': load.min(),
+        'load_max': load.max(),
+        'temp_mean': _df['temp_mean'].mean(),
+        'anomaly_count': anomaly_count,
+        'anomaly_rate': anomaly_count / len(_df) * 100 if len(_df) else np.nan,
+        'top_anomalies': top_anomaly_rows(_df, is_anomaly),
     }
 
-    h4 {
-        color: #334155;
-        font-weight: 500;
-        margin-top: 1rem;
-        margin-bottom: 0.75rem;
+
+def top_anomaly_rows(
+    df: pd.DataFrame,
+    is_anomaly: np.ndarray,
+    n: int = 10,
+    score_col: str = 'load_zscore'
+) -> np.ndarray:
+    """
+    Row positions of the n anomalies with the largest score.
+
+    Same rows and order as ``df[is_anomaly].nlargest(n, score_col)``,
+    using a partial sort of the anomalous rows only.
+
+    Args:
+        df: Filtered DataFrame
+        is_anomaly: Boolean anomaly mask aligned with df
+        n: Number of rows to return
+        score_col: Column to rank by (Z-score by default)
+
+    Returns:
+        Row positions, highest score first (empty if score_col is missing)
+    """
+    if score_col not in df.columns:
+        return np.empty(0, dtype=np.intp)
+
+    score = df[score_col].to_numpy(dtype=np.float64)
+    candidates = np.flatnonzero(is_anomaly & ~np.isnan(score))
+    if len(candidates) > n:
+        # Keep ties at the cut-off so the stable sort below can pick the first ones
+        cutoff = np.partition(score[candidates], len(candidates) - n)[len(candidates) - n]
+        candidates = candidates[score[candidates] >= cutoff]
+    order = np.argsort(-score[candidates], kind='stable')
+    return candidates[order[:n]]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def numeric_columns(year: int, _df: pd.DataFrame) -> list:
+    """
+    Numeric column names of the loaded data.
+
+    The schema only depends on the loaded file, so the result is cached
+    per year and reused across filters and reruns.
+
+    Args:
+        year: Loaded year (identifies the schema)
+        _df: Loaded DataFrame (not hashed)
+
+    Returns:
+        List of numeric column names
+    """
+    return _df.select_dtypes(include='number').columns.tolist()
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def compute_correlation(filter_key: tuple, columns: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Correlation matrix of the selected columns, cached per filter and column set.
+
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        columns: Columns to correlate, sorted so the same set in another
+                 selection order hits the same entry
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
+
+    Returns:
+        Correlation matrix
+    """
+    return charts.correlation_matrix(_df, list(columns))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_regional_stats(filter_key: tuple, _df: pd.DataFrame) -> dict:
+    """
+    Compute every per-region aggregate used by the Regional Analysis tab.
+
+    One grouped aggregation feeds the bar chart and the statistics table,
+    and one groupby split provides the box-plot values.
+
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
+
+    Returns:
+        Dictionary with the aggregate table ('stats'), its rounded and
+        labelled display version ('table') and the load values of each
+        region ('load_values')
+    """
+    stats = _df.groupby('region', observed=True, sort=False).agg({
+        'val_cargaenergiamwmed': ['mean', 'std', 'min', 'max', 'median'],
+        'temp_mean': ['mean', 'std'],
+        'is_anomaly': 'sum'
+    })
+    load_values = {
+        region: values.to_numpy()
+        for region, values in _df.groupby('region', sort=False, observed=True)['val_cargaenergiamwmed']
     }
-    </style>
-""", unsafe_allow_html=True)
+    table = stats.drop(columns=[('val_cargaenergiamwmed', 'median')])
+    # Round in float64: rounded float32 values still print as e.g. 26.290001
+    float32_cols = table.columns[table.dtypes == 'float32']
+    table[float32_cols] = table[float32_cols].astype('float64')
+    table = table.round(2)
+    table.columns = ['Load Mean (MW)', 'Load Std', 'Load Min', 'Load Max',
+                     'Temp Mean (°C)', 'Temp Std', 'Anomalies']
+    return {'stats': stats, 'table': table, 'load_values': load_values}
+
+
+@st.cache_resource(ttl=3600, max_entries=64, show_spinner=False)
+def cached_figure(filter_key: tuple, chart: str, _build: Callable[[], go.Figure]) -> go.Figure:
+    """
+    Build a chart once per filter and reuse the Figure on later reruns.
 
+    Figures are shared read-only (st.plotly_chart serializes a copy), so
+    cache_resource avoids both rebuilding and unpickling them.
 
-# ============================================================================
-# DATA LOADING (with caching)
-# ============================================================================
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        chart: Name of the chart (distinguishes charts on the same data)
+        _build: Zero-argument function building the figure (not hashed)
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_processed_data(year: int = 2023) -> pd.DataFrame:
+    Returns:
+        Plotly Figure
     """
-    Load and process data using the robust pipeline.
+    return _build()
 
-    This function leverages the production-ready ONSLoader, INMETLoader,
-    and Preprocessor to provide clean, feature-engineered data.
+
+@st.cache_data(ttl=3600, max_entries=8, show_spinner=False)
+def build_exports(filter_key: tuple, columns: tuple, _df: pd.DataFrame) -> dict:
+    """
+    Serialize the selected columns to CSV and JSON once per selection.
 
     Args:
-        year: Year to load (default 2023)
+        filter_key: (year, region, date range) identifying the filtered data
+        columns: Columns to export
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
 
     Returns:
-        Processed DataFrame with 19 features
+        Dictionary with the 'csv' and 'json' file contents (bytes)
     """
-    # Try to load from cached Parquet first
-    cache_path = Path("data/processed/energy_weather_processed.parquet")
+    export_df = _df[list(columns)]
 
-    if cache_path.exists():
-        st.info("📦 Loading from cache (Parquet)...")
-        df = pd.read_parquet(cache_path)
-        return df
+    csv = export_df.to_csv(index=False).encode('utf-8')
+    json_data = export_df.to_json(orient='records', date_format='iso').encode('utf-8')
 
-    # If no cache, run full pipeline
-    st.info("🔄 Running data pipeline... This may take a few minutes.")
+    return {'csv': csv, 'json': json_data}
 
-    with st.spinner("Loading ONS energy data..."):
-        ons_loader = ONSLoader()
-        ons_df = ons_loader.load(year)
 
-    with st.spinner("Loading INMET weather data (567 stations)..."):
-        inmet_loader = INMETLoader()
-        inmet_df = inmet_loader.load(year)
+@st.cache_data(ttl=3600, max_entries=4, show_spinner="Building Excel file…")
+def build_excel_export(filter_key: tuple, columns: tuple, _df: pd.DataFrame) -> bytes:
+    """
+    Write the selected columns and a summary sheet to an Excel workbook.
 
-    with st.spinner("Processing and merging data..."):
-        preprocessor = Preprocessor()
-        df = preprocessor.process(ons_df, inmet_df, save=True)
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        columns: Columns to export
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
 
-    st.success("✅ Data loaded successfully!")
-    return df
+    Returns:
+        Contents of the .xlsx file (see exports.to_excel_bytes)
+    """
+    return exports.to_excel_bytes(_df[list(columns)])
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_ml_model(path: str, mtime_ns: int) -> AnomalyDetector:
+    """
+    Load the trained anomaly detector once per model file version.
+
+    Args:
+        path: Path to the pickled model
+        mtime_ns: Modification time of the file; retraining changes it
+                  and reloads the model
+
+    Returns:
+        Trained AnomalyDetector (shared across sessions; read-only)
+    """
+    return AnomalyDetector.load(path)
+
+
+@st.cache_data(ttl=3600, max_entries=16, show_spinner=False)
+def run_predictions(
+    filter_key: tuple,
+    model_path: str,
+    model_mtime_ns: int,
+    _detector: AnomalyDetector,
+    _df: pd.DataFrame
+) -> tuple:
+    """
+    Model predictions for the filtered data, cached per filter and model.
+
+    Args:
+        filter_key: (year, region, date range) identifying the filtered data
+        model_path: Path of the loaded model (identifies _detector)
+        model_mtime_ns: Modification time of the model file (retraining
+                        invalidates cached predictions)
+        _detector: Trained AnomalyDetector (not hashed)
+        _df: Filtered DataFrame (not hashed; identified by filter_key)
+
+    Returns:
+        Tuple (predictions, prediction_proba)
+    """
+    return _detector.predict(_df), _detector.predict_proba(_df)
 
 
 # ============================================================================
@@ -296,7 +417,7 @@ with st.sidebar:
 
     # Region filter
     st.markdown("### 🗺️ Region Filter")
-    all_regions = ['All', 'Norte', 'Nordeste', 'Sudeste/Centro-Oeste', 'Sul']
+    all_regions = ['All'] + REGIONS
     selected_region = st.selectbox(
         "Select Region",
         options=all_regions,
@@ -328,23 +449,34 @@ with st.sidebar:
 # LOAD DATA
 # ============================================================================
 
-# Load data with progress indicator
-df = load_processed_data(selected_year)
+# Load data with progress indicator (region slice comes from the cache)
+df = load_region_data(selected_year, selected_region)
 
-# Apply filters
-if selected_region != 'All':
-    df = df[df['region'] == selected_region]
+if df.empty:
+    st.warning(f"⚠️ No data available for {selected_region} in {selected_year}.")
+    st.stop()
 
+# Apply filters
+date_key = None
 if use_date_filter:
+    # df is sorted by date: the bounds are the first and last rows
+    dates = df['date'].to_numpy()
+    d_min, d_max = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
     date_range = st.sidebar.date_input(
         "Select date range",
-        value=(df['date'].min(), df['date'].max()),
-        min_value=df['date'].min().date(),
-        max_value=df['date'].max().date()
+        value=(d_min, d_max),
+        min_value=d_min.date(),
+        max_value=d_max.date()
     )
     if len(date_range) == 2:
-        df = df[(df['date'] >= pd.Timestamp(date_range[0])) &
-                (df['date'] <= pd.Timestamp(date_range[1]))]
+        # Slice bounds by binary search, no mask
+        start = dates.searchsorted(np.datetime64(date_range[0]), side='left')
+        end = dates.searchsorted(np.datetime64(date_range[1]), side='right')
+        df = df.iloc[start:end]
+        date_key = tuple(date_range)
+
+# Identifies the filtered data for cached computations
+filter_key = (selected_year, selected_region, date_key)
 
 
 # ============================================================================
@@ -370,28 +502,30 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
+kpi_stats = compute_kpi_stats(filter_key, df)
+
 kpi_metrics = [
     {
         'label': 'Avg Energy Load',
-        'value': df['val_cargaenergiamwmed'].mean(),
+        'value': kpi_stats['load_mean'],
         'format': '{:,.0f} MW',
         'help': 'Average energy load across all regions and dates'
     },
     {
         'label': 'Avg Temperature',
-        'value': df['temp_mean'].mean(),
+        'value': kpi_stats['temp_mean'],
         'format': '{:.1f} °C',
         'help': 'Average temperature across all regions'
     },
     {
         'label': 'Anomalies Detected',
-        'value': df['is_anomaly'].sum(),
+        'value': kpi_stats['anomaly_count'],
         'format': '{:.0f}',
         'help': 'Number of anomalies detected (Z-score > 2.5)'
     },
     {
         'label': 'Anomaly Rate',
-        'value': df['is_anomaly'].mean() * 100,
+        'value': kpi_stats['anomaly_rate'],
         'format': '{:.2f} %',
         'help': 'Percentage of records flagged as anomalies'
     }
@@ -406,22 +540,31 @@ st.markdown("---")
 # MAIN VISUALIZATIONS
 # ============================================================================
 
-# Tab-based navigation
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+# Section navigation: only the selected section runs, so figures of the
+# other sections are not built on every rerun (st.tabs renders all of them)
+TABS = [
     "📈 Overview",
     "🗺️ Regional Analysis",
     "⚠️ Anomalies",
     "🔬 Correlation",
     "🤖 ML Predictions",
     "📥 Export & Reports"
-])
+]
+tab1, tab2, tab3, tab4, tab5, tab6 = TABS
+active_tab = st.radio(
+    "Section",
+    options=TABS,
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_tab"
+)
 
 # TAB 1: OVERVIEW
-with tab1:
+if active_tab == tab1:
     st.markdown("### Energy Load vs Temperature Over Time")
 
     # Dual-axis chart
-    fig_dual = charts.create_dual_axis_chart(
+    fig_dual = cached_figure(filter_key, 'dual', lambda: charts.create_dual_axis_chart(
         df=df,
         x_col='date',
         y1_col='val_cargaenergiamwmed',
@@ -429,71 +572,70 @@ with tab1:
         y1_label='Energy Load (MW)',
         y2_label='Temperature (°C)',
         title='Energy Load and Temperature Trends'
-    )
+    ))
     st.plotly_chart(fig_dual, use_container_width=True)
 
     st.markdown("### Energy Load with Confidence Bands")
 
     # Time series with bands
-    fig_bands = charts.create_time_series_with_bands(
+    fig_bands = cached_figure(filter_key, 'bands', lambda: charts.create_time_series_with_bands(
         df=df,
         x_col='date',
         y_col='val_cargaenergiamwmed',
         title='Energy Load with ±1σ and ±2σ Confidence Bands',
-        y_label='Energy Load (MW)'
-    )
+        y_label='Energy Load (MW)',
+        mean_val=kpi_stats['load_mean'],
+        std_val=kpi_stats['load_std']
+    ))
     st.plotly_chart(fig_bands, use_container_width=True)
 
     # Statistics summary
     metrics.display_stat_summary(
         title="Energy Load Statistics",
-        mean=df['val_cargaenergiamwmed'].mean(),
-        median=df['val_cargaenergiamwmed'].median(),
-        std=df['val_cargaenergiamwmed'].std(),
-        min_val=df['val_cargaenergiamwmed'].min(),
-        max_val=df['val_cargaenergiamwmed'].max(),
+        mean=kpi_stats['load_mean'],
+        median=kpi_stats['load_median'],
+        std=kpi_stats['load_std'],
+        min_val=kpi_stats['load_min'],
+        max_val=kpi_stats['load_max'],
         unit="MW"
     )
 
 
 # TAB 2: REGIONAL ANALYSIS
-with tab2:
+if active_tab == tab2:
     st.markdown("### Regional Comparison")
 
+    regional = compute_regional_stats(filter_key, df)
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### Average Energy Load by Region")
-        fig_regional_bar = charts.create_regional_comparison(
+        fig_regional_bar = cached_figure(filter_key, 'regional_bar', lambda: charts.create_regional_comparison(
             df=df,
             region_col='region',
             value_col='val_cargaenergiamwmed',
             title='Average Energy Load by Region',
-            chart_type='bar'
-        )
+            chart_type='bar',
+            region_means=regional['stats'][('val_cargaenergiamwmed', 'mean')]
+        ))
         st.plotly_chart(fig_regional_bar, use_container_width=True)
 
     with col2:
         st.markdown("#### Energy Load Distribution by Region")
-        fig_regional_box = charts.create_regional_comparison(
+        fig_regional_box = cached_figure(filter_key, 'regional_box', lambda: charts.create_regional_comparison(
             df=df,
             region_col='region',
             value_col='val_cargaenergiamwmed',
             title='Energy Load Distribution',
-            chart_type='box'
-        )
+            chart_type='box',
+            region_values=regional['load_values']
+        ))
         st.plotly_chart(fig_regional_box, use_container_width=True)
 
     # Regional statistics table
     st.markdown("#### Regional Statistics Summary")
-    regional_stats = df.groupby('region').agg({
-        'val_cargaenergiamwmed': ['mean', 'std', 'min', 'max'],
-        'temp_mean': ['mean', 'std'],
-        'is_anomaly': 'sum'
-    }).round(2)
-    regional_stats.columns = ['Load Mean (MW)', 'Load Std', 'Load Min', 'Load Max',
-                               'Temp Mean (°C)', 'Temp Std', 'Anomalies']
-    st.dataframe(regional_stats, use_container_width=True)
+    st.dataframe(regional['table'], use_container_width=True)
 
     # Temporal Analysis
     st.markdown("---")
@@ -503,56 +645,56 @@ with tab2:
 
     with col1:
         st.markdown("#### Moving Averages (7 & 30 days)")
-        fig_ma = charts.create_time_series_with_moving_avg(
+        fig_ma = cached_figure(filter_key, 'ma', lambda: charts.create_time_series_with_moving_avg(
             df=df,
             x_col='date',
             y_col='val_cargaenergiamwmed',
             windows=[7, 30],
             title='Energy Load with Moving Averages',
             y_label='Energy Load (MW)'
-        )
+        ))
         st.plotly_chart(fig_ma, use_container_width=True)
 
     with col2:
         st.markdown("#### Seasonal Patterns")
-        fig_seasonal = charts.create_seasonal_analysis(
+        fig_seasonal = cached_figure(filter_key, 'seasonal', lambda: charts.create_seasonal_analysis(
             df=df,
             date_col='date',
             value_col='val_cargaenergiamwmed',
             title='Energy Load by Season'
-        )
+        ))
         st.plotly_chart(fig_seasonal, use_container_width=True)
 
     # Monthly heatmap
     st.markdown("#### Monthly Patterns Heatmap")
-    fig_heatmap = charts.create_monthly_heatmap(
+    fig_heatmap = cached_figure(filter_key, 'heatmap', lambda: charts.create_monthly_heatmap(
         df=df,
         date_col='date',
         value_col='val_cargaenergiamwmed',
         title='Average Energy Load by Day and Month'
-    )
+    ))
     st.plotly_chart(fig_heatmap, use_container_width=True)
 
 
 # TAB 3: ANOMALIES
-with tab3:
+if active_tab == tab3:
     st.markdown("### Anomaly Detection Results")
 
     # Anomaly scatter plot
     if 'load_zscore' in df.columns:
-        fig_anomaly = charts.create_anomaly_scatter(
+        fig_anomaly = cached_figure(filter_key, 'anomaly', lambda: charts.create_anomaly_scatter(
             df=df,
             x_col='date',
             y_col='load_zscore',
             anomaly_col='is_anomaly',
             title='Anomaly Detection (Z-score Method)'
-        )
+        ))
         st.plotly_chart(fig_anomaly, use_container_width=True)
 
     # Anomaly table
     st.markdown("#### Top 10 Anomalies")
     if 'load_zscore' in df.columns:
-        anomalies_df = df[df['is_anomaly'] == 1].nlargest(10, 'load_zscore')[
+        anomalies_df = df.iloc[kpi_stats['top_anomalies']][
             ['date', 'region', 'val_cargaenergiamwmed', 'temp_mean', 'load_zscore']
         ]
         anomalies_df.columns = ['Date', 'Region', 'Load (MW)', 'Temp (°C)', 'Z-Score']
@@ -562,11 +704,23 @@ with tab3:
 
 
 # TAB 4: CORRELATION
-with tab4:
+@st.fragment
+def correlation_section(df: pd.DataFrame, filter_key: tuple, year: int) -> None:
+    """
+    Correlation tab body.
+
+    Runs as a fragment: changing the variable selection reruns only this
+    section, not the KPI row and sidebar above it.
+
+    Args:
+        df: Filtered DataFrame
+        filter_key: (year, region, date range) identifying df
+        year: Loaded year
+    """
     st.markdown("### Correlation Analysis")
 
     # Select columns for correlation
-    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    numeric_cols = numeric_columns(year, df)
     selected_cols = st.multiselect(
         "Select variables for correlation analysis",
         options=numeric_cols,
@@ -574,11 +728,19 @@ with tab4:
                 'radiation_mean', 'precipitation_total'][:min(6, len(numeric_cols))]
     )
 
+    # Computed once per filter/column set and shared by heatmap and table
+    corr_matrix = None
+    if len(selected_cols) >= 2:
+        corr_matrix = compute_correlation(filter_key, tuple(sorted(selected_cols)), df)
+        # Back to the selection order for display
+        corr_matrix = corr_matrix.loc[selected_cols, selected_cols]
+
     if len(selected_cols) >= 2:
         fig_corr = charts.create_correlation_heatmap(
             df=df,
             columns=selected_cols,
-            title='Correlation Matrix'
+            title='Correlation Matrix',
+            precomputed_corr=corr_matrix
         )
         st.plotly_chart(fig_corr, use_container_width=True)
     else:
@@ -587,26 +749,24 @@ with tab4:
     # Correlation insights
     if len(selected_cols) >= 2:
         st.markdown("#### Key Correlations")
-        corr_matrix = df[selected_cols].corr()
-
-        # Find top 5 correlations (excluding diagonal)
-        corr_pairs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_pairs.append({
-                    'Variable 1': corr_matrix.columns[i],
-                    'Variable 2': corr_matrix.columns[j],
-                    'Correlation': corr_matrix.iloc[i, j]
-                })
-
-        corr_df = pd.DataFrame(corr_pairs).sort_values('Correlation',
-                                                       key=abs,
-                                                       ascending=False).head(5)
+
+        # Find top 5 correlations (upper triangle, excluding diagonal)
+        corr_values = corr_matrix.to_numpy()
+        rows, cols = np.triu_indices_from(corr_values, k=1)
+        corr_df = pd.DataFrame({
+            'Variable 1': corr_matrix.columns[rows],
+            'Variable 2': corr_matrix.columns[cols],
+            'Correlation': corr_values[rows, cols]
+        }).sort_values('Correlation', key=abs, ascending=False).head(5)
         st.dataframe(corr_df, use_container_width=True, hide_index=True)
 
 
+if active_tab == tab4:
+    correlation_section(df, filter_key, selected_year)
+
+
 # TAB 5: ML PREDICTIONS
-with tab5:
+if active_tab == tab5:
     st.markdown("### 🤖 Machine Learning Anomaly Detection")
 
     st.info("""
@@ -622,13 +782,9 @@ with tab5:
         st.code("python scripts/train_model.py", language="bash")
         st.info("After training, refresh this page to see predictions.")
     else:
-        # Load model
-        @st.cache_resource
-        def load_ml_model():
-            return AnomalyDetector.load(str(model_path))
-
         try:
-            detector = load_ml_model()
+            model_mtime_ns = model_path.stat().st_mtime_ns
+            detector = load_ml_model(str(model_path), model_mtime_ns)
             st.success("✅ Model loaded successfully!")
 
             # Model info
@@ -645,14 +801,21 @@ with tab5:
             # Make predictions
             st.markdown("#### 📊 Model Predictions vs Ground Truth")
 
-            # Predict on current data
-            predictions = detector.predict(df)
-            prediction_proba = detector.predict_proba(df)
+            # Predict on current data (cached per filter and model)
+            predictions, prediction_proba = run_predictions(
+                filter_key, str(model_path), model_mtime_ns, detector, df
+            )
+
+            # Add predictions to the columns shown below (no full-frame copy)
+            display_cols = ['date', 'region', 'val_cargaenergiamwmed', 'temp_mean', 'is_anomaly']
+            df_with_pred = df[display_cols].assign(
+                ml_prediction=predictions,
+                ml_confidence=prediction_proba[:, 1]  # Probability of anomaly
+            )
 
-            # Add predictions to dataframe
-            df_with_pred = df.copy()
-            df_with_pred['ml_prediction'] = predictions
-            df_with_pred['ml_confidence'] = prediction_proba[:, 1]  # Probability of anomaly
+            # Agreement on raw arrays (no index alignment)
+            ground_truth = df['is_anomaly'].to_numpy(dtype=np.int8)
+            disagree_mask = np.asarray(predictions, dtype=np.int8) != ground_truth
 
             # Comparison metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -666,11 +829,11 @@ with tab5:
             with col2:
                 st.metric(
                     "Ground Truth Anomalies",
-                    f"{df['is_anomaly'].sum()}"
+                    f"{kpi_stats['anomaly_count']}"
                 )
 
             with col3:
-                agreement = (predictions == df['is_anomaly']).mean()
+                agreement = 1.0 - disagree_mask.mean()
                 st.metric(
                     "Agreement Rate",
                     f"{agreement:.1%}"
@@ -690,8 +853,6 @@ with tab5:
             importance_df = detector.get_feature_importance()
 
             # Create bar chart for feature importance
-            import plotly.graph_objects as go
-
             fig_importance = go.Figure(data=[
                 go.Bar(
                     x=importance_df['importance'],
@@ -719,9 +880,7 @@ with tab5:
             st.markdown("#### 🔍 Prediction Details")
 
             # Show predictions where model disagrees with ground truth
-            disagreements = df_with_pred[
-                df_with_pred['ml_prediction'] != df_with_pred['is_anomaly']
-            ]
+            disagreements = df_with_pred.iloc[np.flatnonzero(disagree_mask)]
 
             if len(disagreements) > 0:
                 st.warning(f"⚠️ Found {len(disagreements)} cases where ML prediction differs from ground truth")
@@ -729,7 +888,7 @@ with tab5:
                 disagreements_display = disagreements[[
                     'date', 'region', 'val_cargaenergiamwmed', 'temp_mean',
                     'is_anomaly', 'ml_prediction', 'ml_confidence'
-                ]].copy()
+                ]]
 
                 disagreements_display.columns = [
                     'Date', 'Region', 'Load (MW)', 'Temp (°C)',
@@ -744,9 +903,10 @@ with tab5:
             st.markdown("---")
             st.markdown("#### 🎯 Top ML Anomaly Predictions (by confidence)")
 
-            ml_anomalies = df_with_pred[df_with_pred['ml_prediction'] == 1].nlargest(
-                10, 'ml_confidence'
-            )[['date', 'region', 'val_cargaenergiamwmed', 'temp_mean', 'ml_confidence', 'is_anomaly']]
+            top_rows = top_anomaly_rows(df_with_pred, predictions == 1, score_col='ml_confidence')
+            ml_anomalies = df_with_pred.iloc[top_rows][
+                ['date', 'region', 'val_cargaenergiamwmed', 'temp_mean', 'ml_confidence', 'is_anomaly']
+            ]
 
             ml_anomalies.columns = ['Date', 'Region', 'Load (MW)', 'Temp (°C)', 'Confidence', 'Ground Truth']
 
@@ -757,8 +917,40 @@ with tab5:
             st.info("Try retraining the model: `python scripts/train_model.py`")
 
 
+@st.fragment
+def data_preview(df: pd.DataFrame) -> None:
+    """
+    First rows of the filtered data; the row slider reruns only this fragment.
+
+    Args:
+        df: Filtered DataFrame
+    """
+    preview_rows = st.slider("Number of rows to preview", min_value=5, max_value=100, value=10)
+    st.dataframe(df.head(preview_rows), use_container_width=True)
+
+
 # TAB 6: EXPORT & REPORTS
-with tab6:
+@st.fragment
+def export_section(
+    df: pd.DataFrame,
+    year: int,
+    region: str,
+    kpi_stats: dict,
+    filter_key: tuple
+) -> None:
+    """
+    Export & Reports tab body.
+
+    Runs as a fragment: export column picks, report options and the
+    generate button rerun only this section.
+
+    Args:
+        df: Filtered DataFrame
+        year: Selected year
+        region: Selected region ('All' for every region)
+        kpi_stats: Cached KPI statistics of df (see compute_kpi_stats)
+        filter_key: (year, region, date range) identifying df
+    """
     st.markdown("### 📥 Export Data & Generate Reports")
 
     st.info("""
@@ -779,57 +971,41 @@ with tab6:
         )
 
         if export_cols:
-            export_df = df[export_cols].copy()
+            files = build_exports(filter_key, tuple(export_cols), df)
 
             # CSV Export
-            csv = export_df.to_csv(index=False).encode('utf-8')
             st.download_button(
                 label="📄 Download as CSV",
-                data=csv,
-                file_name=f"energy_data_{selected_year}_{selected_region}.csv",
+                data=files['csv'],
+                file_name=f"energy_data_{year}_{region}.csv",
                 mime="text/csv",
                 use_container_width=True
             )
 
-            # Excel Export
-            from io import BytesIO
-            buffer = BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                export_df.to_excel(writer, sheet_name='Data', index=False)
-
-                # Add summary sheet
-                summary_df = pd.DataFrame({
-                    'Metric': ['Total Records', 'Date Range', 'Regions', 'Avg Load (MW)', 'Anomalies'],
-                    'Value': [
-                        len(export_df),
-                        f"{export_df['date'].min()} to {export_df['date'].max()}" if 'date' in export_df else 'N/A',
-                        export_df['region'].nunique() if 'region' in export_df else 'N/A',
-                        f"{export_df['val_cargaenergiamwmed'].mean():.2f}" if 'val_cargaenergiamwmed' in export_df else 'N/A',
-                        export_df['is_anomaly'].sum() if 'is_anomaly' in export_df else 'N/A'
-                    ]
-                })
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-
-            excel_data = buffer.getvalue()
-            st.download_button(
-                label="📊 Download as Excel",
-                data=excel_data,
-                file_name=f"energy_data_{selected_year}_{selected_region}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+            # Excel Export (built on request: the workbook is the slowest format)
+            excel_key = (filter_key, tuple(export_cols))
+            if st.button("📊 Build Excel", use_container_width=True):
+                st.session_state['excel_export_key'] = excel_key
+
+            if st.session_state.get('excel_export_key') == excel_key:
+                st.download_button(
+                    label="📊 Download as Excel",
+                    data=build_excel_export(filter_key, tuple(export_cols), df),
+                    file_name=f"energy_data_{year}_{region}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
 
             # JSON Export
-            json_data = export_df.to_json(orient='records', date_format='iso').encode('utf-8')
             st.download_button(
                 label="🔗 Download as JSON",
-                data=json_data,
-                file_name=f"energy_data_{selected_year}_{selected_region}.json",
+                data=files['json'],
+                file_name=f"energy_data_{year}_{region}.json",
                 mime="application/json",
                 use_container_width=True
             )
 
-            st.success(f"✅ Ready to export {len(export_df)} records with {len(export_cols)} columns")
+            st.success(f"✅ Ready to export {len(df)} records with {len(export_cols)} columns")
 
     with col2:
         st.markdown("#### 📈 Generate Report")
@@ -870,7 +1046,7 @@ with tab6:
             with st.spinner("Generating report..."):
                 # Generate markdown report
                 report_md = f"""# Energy Analytics Report
-## Period: {selected_year} | Region: {selected_region}
+## Period: {year} | Region: {region}
 
 ---
 
@@ -881,7 +1057,7 @@ with tab6:
 - Date Range: {df['date'].min()} to {df['date'].max()}
 - Average Energy Load: {df['val_cargaenergiamwmed'].mean():,.0f} MW
 - Average Temperature: {df['temp_mean'].mean():.1f}°C
-- Anomalies Detected: {df['is_anomaly'].sum()} ({df['is_anomaly'].mean()*100:.2f}%)
+- Anomalies Detected: {kpi_stats['anomaly_count']} ({kpi_stats['anomaly_rate']:.2f}%)
 
 ---
 
@@ -907,10 +1083,9 @@ with tab6:
 
 """
                 # Add regional stats
-                for region in df['region'].unique():
-                    region_df = df[df['region'] == region]
+                for name, region_df in df.groupby('region', observed=True, sort=False):
                     report_md += f"""
-#### {region}
+#### {name}
 - Records: {len(region_df):,}
 - Avg Load: {region_df['val_cargaenergiamwmed'].mean():,.0f} MW
 - Avg Temp: {region_df['temp_mean'].mean():.1f}°C
@@ -923,9 +1098,9 @@ with tab6:
 
 ### ⚠️ Anomaly Detection
 
-**Total Anomalies:** {df['is_anomaly'].sum()}
+**Total Anomalies:** {kpi_stats['anomaly_count']}
 
-**Anomaly Rate:** {df['is_anomaly'].mean()*100:.2f}%
+**Anomaly Rate:** {kpi_stats['anomaly_rate']:.2f}%
 
 **Detection Method:** Z-score (threshold: ±2.5σ)
 
@@ -948,7 +1123,7 @@ with tab6:
                     st.download_button(
                         label="📝 Download Markdown",
                         data=report_md.encode('utf-8'),
-                        file_name=f"energy_report_{selected_year}_{selected_region}.md",
+                        file_name=f"energy_report_{year}_{region}.md",
                         mime="text/markdown",
                         use_container_width=True
                     )
@@ -979,7 +1154,7 @@ with tab6:
                     st.download_button(
                         label="🌐 Download HTML",
                         data=html_report.encode('utf-8'),
-                        file_name=f"energy_report_{selected_year}_{selected_region}.html",
+                        file_name=f"energy_report_{year}_{region}.html",
                         mime="text/html",
                         use_container_width=True
                     )
@@ -988,8 +1163,7 @@ with tab6:
     st.markdown("---")
     st.markdown("### 👁️ Data Preview")
 
-    preview_rows = st.slider("Number of rows to preview", min_value=5, max_value=100, value=10)
-    st.dataframe(df.head(preview_rows), use_container_width=True)
+    data_preview(df)
 
     # Dataset info
     st.markdown("---")
@@ -1007,6 +1181,10 @@ with tab6:
         st.metric("Missing Values", f"{df.isnull().sum().sum()}")
 
 
+if active_tab == tab6:
+    export_section(df, selected_year, selected_region, kpi_stats, filter_key)
+
+
 # ============================================================================
 # FOOTER
 # ============================================================================
@@ -0,0 +1,38 @@
+"""
+Page theme for the dashboard.
+
+The stylesheet lives in assets/styles.css and is read once per server
+process; ``apply_theme`` injects it into the current page.
+"""
+
+from pathlib import Path
+import streamlit as st
+
+
+STYLESHEET = Path(__file__).parent / "assets" / "styles.css"
+
+
+@st.cache_resource
+def load_css() -> str:
+    """
+    Read the dashboard stylesheet once per server process.
+
+    Returns:
+        Contents of assets/styles.css
+    """
+    return STYLESHEET.read_text(encoding="utf-8")
+
+
+def apply_theme() -> None:
+    """
+    Inject the dashboard stylesheet into the page.
+
+    Call once per script run, right after ``st.set_page_config``. The
+    <style> element must be emitted on every rerun: Streamlit removes
+    elements that a rerun does not write again.
+
+    Example:
+        >>> st.set_page_config(page_title="Energy Analytics Dashboard", layout="wide")
+        >>> apply_theme()
+    """
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
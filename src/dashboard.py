@@ -8,17 +8,15 @@ expandido com funcionalidades profissionais.
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from pathlib import Path
 from io import BytesIO
 
 # Import components profissionais
 from src.app.components import charts, metrics
 
-# Import ML model
-try:
-    from src.models.anomaly_detector import AnomalyDetector
-except ImportError:
-    AnomalyDetector = None
+# O modelo ML (scikit-learn/XGBoost) é importado dentro de ml_predictions:
+# só quem abre essa análise paga o custo do import
 
 
 # ============================================================================
@@ -36,7 +34,7 @@ def correlacao(df):
     num_df = df.select_dtypes(include="number")
 
     # Exibe a matriz diretamente
-    st.dataframe(num_df.corr())
+    st.dataframe(charts.correlation_matrix(num_df))
 
     # NOVO: Adiciona heatmap visual
     st.markdown("### Heatmap de Correlação")
@@ -86,10 +84,39 @@ def serie(df):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def comparar(df, all_df):
+def resumo_regional(all_df, var):
+    """
+    Estatísticas e valores de uma variável por região.
+
+    Args:
+        all_df: DataFrame completo (todas as regiões)
+        var: Variável numérica a resumir
+
+    Returns:
+        Tupla (DataFrame com a coluna de região e mean/std/count,
+               dicionário {região: array de valores})
+    """
+    # Tenta usar 'region' primeiro, se não existir usa 'regiao'
+    region_col = 'region' if 'region' in all_df.columns else 'regiao'
+
+    stats = all_df.groupby(region_col, observed=True)[var].agg(['mean', 'std', 'count']).reset_index()
+    valores = {
+        region: values.to_numpy()
+        for region, values in all_df.groupby(region_col, sort=False, observed=True)[var]
+    }
+    return stats, valores
+
+
+def comparar(df, resumo_por_variavel):
     """
     Compara a média de uma variável entre todas as regiões.
     Útil para ver diferenças estruturais regionais.
+
+    Args:
+        df: DataFrame filtrado (define as variáveis disponíveis)
+        resumo_por_variavel: Função var -> (stats, valores) com o resumo de
+            todas as regiões (ver `resumo_regional`); quem chama decide como
+            guardá-lo em cache, sem repassar o DataFrame completo
     """
     st.subheader("Comparar regiões")
 
@@ -97,27 +124,26 @@ def comparar(df, all_df):
     cols = df.select_dtypes(include="number").columns
     var = st.selectbox("Variável", cols)
 
-    # Tenta usar 'region' primeiro, se não existir usa 'regiao'
-    region_col = 'region' if 'region' in all_df.columns else 'regiao'
-
-    # Calcula média da variável selecionada por região
-    mean_df = all_df.groupby(region_col)[var].mean().reset_index()
+    # Média, desvio e valores de todas as regiões
+    stats, valores = resumo_por_variavel(var)
+    region_col = stats.columns[0]
 
     # Plota comparação por barras
+    mean_df = stats[[region_col, 'mean']].rename(columns={'mean': var})
     fig = px.bar(mean_df, x=region_col, y=var)
     st.plotly_chart(fig, use_container_width=True)
 
     # NOVO: Adiciona box plot para ver distribuição
     st.markdown("### Distribuição por Região")
-    if region_col in all_df.columns and var in all_df.columns:
-        fig_regional = charts.create_regional_comparison(
-            df=all_df,
-            region_col=region_col,
-            value_col=var,
-            title=f'Distribuição de {var} por Região',
-            chart_type='box'
-        )
-        st.plotly_chart(fig_regional, use_container_width=True)
+    fig_regional = charts.create_regional_comparison(
+        df=df,
+        region_col=region_col,
+        value_col=var,
+        title=f'Distribuição de {var} por Região',
+        chart_type='box',
+        region_values=valores
+    )
+    st.plotly_chart(fig_regional, use_container_width=True)
 
 
 # ============================================================================
@@ -189,6 +215,22 @@ def overview(df):
         st.plotly_chart(fig_bands, use_container_width=True)
 
 
+@st.cache_data(ttl=3600)
+def medias_moveis(valores: np.ndarray, janelas: tuple) -> dict:
+    """
+    Calcula médias móveis de uma série, em cache entre reruns.
+
+    Args:
+        valores: Valores da série, em ordem temporal
+        janelas: Tamanhos das janelas (em dias)
+
+    Returns:
+        Dicionário {janela: array de médias móveis}
+    """
+    serie = pd.Series(valores)
+    return {janela: serie.rolling(window=janela).mean().to_numpy() for janela in janelas}
+
+
 def temporal(df):
     """
     Análise temporal e sazonal.
@@ -206,7 +248,8 @@ def temporal(df):
                 y_col='val_cargaenergiamwmed',
                 windows=[7, 30],
                 title='Carga com Médias Móveis (7 e 30 dias)',
-                y_label='Carga (MW)'
+                y_label='Carga (MW)',
+                moving_averages=medias_moveis(df['val_cargaenergiamwmed'].to_numpy(), (7, 30))
             )
             st.plotly_chart(fig_ma, use_container_width=True)
 
@@ -295,7 +338,9 @@ def ml_predictions(df):
         st.info("Treine o modelo primeiro: `python scripts/train_model.py`")
         return
 
-    if AnomalyDetector is None:
+    try:
+        from src.models.anomaly_detector import AnomalyDetector
+    except ImportError:
         st.error("Erro ao importar AnomalyDetector")
         return
 
@@ -8,9 +8,112 @@ import requests
 import pandas as pd
 import zipfile
 import io
+import json
+import hashlib
 from src.utils.config import extract_state_from_filename, get_region_from_state
 
 
+# Chunk size for streamed downloads (bounds memory to one chunk)
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _metadata_path(dest: Path) -> Path:
+    """Return the sidecar file holding HTTP validators and checksum for a download."""
+    return dest.with_name(dest.name + '.meta.json')
+
+
+def _file_digest(path: Path) -> str:
+    """Compute the BLAKE2b checksum of a file, reading it in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _conditional_headers(dest: Path) -> dict:
+    """
+    Build If-None-Match / If-Modified-Since headers for a cached download.
+
+    Validators are only sent when the cached file still matches the
+    checksum recorded at download time; a missing, corrupted or edited
+    file forces a full download.
+
+    Args:
+        dest: Cached file path
+
+    Returns:
+        Dictionary of conditional request headers (empty if not applicable)
+    """
+    meta_path = _metadata_path(dest)
+    if not dest.exists() or not meta_path.exists():
+        return {}
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+    if meta.get('blake2b') != _file_digest(dest):
+        return {}
+
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+
+def _stream_download(url: str, dest: Path, timeout: float) -> bool:
+    """
+    Download a URL to disk in fixed-size chunks, skipping unchanged files.
+
+    If a previous download of ``dest`` recorded an ETag/Last-Modified, the
+    request is conditional and a 304 response leaves the file untouched.
+    Otherwise the body is written to a temporary '.part' file while it
+    streams and renamed on success, so an interrupted download never
+    leaves a truncated file behind that would later be mistaken for a
+    valid cache. The checksum is computed while streaming and stored with
+    the validators in a '.meta.json' sidecar.
+
+    Args:
+        url: URL to download
+        dest: Destination file path
+        timeout: Seconds to wait for the server between received bytes
+
+    Returns:
+        True if the file was downloaded, False if the remote file is unchanged
+
+    Raises:
+        requests.HTTPError: If the server returns an error status
+    """
+    tmp_path = dest.with_name(dest.name + '.part')
+    digest = hashlib.blake2b(digest_size=16)
+
+    with requests.get(url, stream=True, timeout=timeout,
+                      headers=_conditional_headers(dest)) as response:
+        if response.status_code == 304:
+            return False
+
+        response.raise_for_status()  # Fail fast on HTTP errors
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'blake2b': digest.hexdigest(),
+        }
+
+    tmp_path.replace(dest)
+    _metadata_path(dest).write_text(json.dumps(meta, indent=2), encoding='utf-8')
+    return True
+
+
 class ONSLoader:
     """
     Loader for ONS electrical system data.
@@ -68,23 +171,24 @@ class ONSLoader:
         cache_path = self._get_cache_path(year)
 
         print(f"Downloading ONS data for {year} from {url}...")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()  # Fail fast on HTTP errors
-
-        # Save to cache
-        cache_path.write_bytes(response.content)
-        print(f"✓ Downloaded and cached at {cache_path}")
+        if _stream_download(url, cache_path, timeout=30):
+            print(f"✓ Downloaded and cached at {cache_path}")
+        else:
+            print(f"✓ Remote file unchanged, keeping cached {cache_path}")
 
         return cache_path
 
-    def load(self, year: int = 2024) -> pd.DataFrame:
+    def load(self, year: int = 2024, refresh: bool = False) -> pd.DataFrame:
         """
         Load ONS energy data for a given year.
 
         Downloads from ONS if not in cache, otherwise uses cached version.
+        With refresh=True, the cache is revalidated via ETag/Last-Modified.
 
         Args:
             year: Year to load (defaults to 2024)
+            refresh: Revalidate the cached file against the server with a
+                     conditional GET (only re-downloads if it changed)
 
         Returns:
             DataFrame with columns:
@@ -100,8 +204,8 @@ class ONSLoader:
         """
         cache_path = self._get_cache_path(year)
 
-        # Download if not cached
-        if not cache_path.exists():
+        # Download if not cached (or revalidate when refreshing)
+        if refresh or not cache_path.exists():
             cache_path = self._download(year)
         else:
             print(f"Using cached data from {cache_path}")
@@ -183,12 +287,10 @@ class INMETLoader:
         cache_path = self._get_cache_path(year)
 
         print(f"Downloading INMET data for {year} from {url}...")
-        response = requests.get(url, timeout=120)
-        response.raise_for_status()
-
-        # Save to cache
-        cache_path.write_bytes(response.content)
-        print(f"✓ Downloaded and cached at {cache_path}")
+        if _stream_download(url, cache_path, timeout=120):
+            print(f"✓ Downloaded and cached at {cache_path}")
+        else:
+            print(f"✓ Remote file unchanged, keeping cached {cache_path}")
 
         return cache_path
 
@@ -253,15 +355,18 @@ class INMETLoader:
         """
         return get_region_from_state(state_code)
 
-    def load(self, year: int = 2024) -> pd.DataFrame:
+    def load(self, year: int = 2024, refresh: bool = False) -> pd.DataFrame:
         """
         Load INMET weather data for a given year.
 
         Downloads from INMET if not in cache, otherwise uses cached version.
+        With refresh=True, the cache is revalidated via ETag/Last-Modified.
         Extracts all station data and combines into a single DataFrame.
 
         Args:
             year: Year to load (defaults to 2024)
+            refresh: Revalidate the cached file against the server with a
+                     conditional GET (only re-downloads if it changed)
 
         Returns:
             DataFrame with weather data from all stations, including:
@@ -279,8 +384,8 @@ class INMETLoader:
         """
         cache_path = self._get_cache_path(year)
 
-        # Download if not cached
-        if not cache_path.exists():
+        # Download if not cached (or revalidate when refreshing)
+        if refresh or not cache_path.exists():
             cache_path = self._download(year)
         else:
             print(f"Using cached data from {cache_path}")
@@ -10,6 +10,16 @@ from typing import Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from src.data.storage import write_processed_feather, write_processed_parquet
+from src.utils.group_ops import (
+    group_sort,
+    group_bounds,
+    group_zscore,
+    group_rolling_mean,
+    group_shift,
+    group_pct_change,
+)
+
 
 class Preprocessor:
     """
@@ -217,30 +227,36 @@ class Preprocessor:
             9: 'Spring', 10: 'Spring', 11: 'Spring'
         })
 
+        # Group codes computed once; the kernels below run over rows
+        # grouped by region without a Python call per group
+        codes, order = group_sort(feature_df['region'])
+        bounds = group_bounds(codes)
+        load = feature_df['val_cargaenergiamwmed'].to_numpy(dtype=np.float64)[order]
+        temp = feature_df['temp_mean'].to_numpy(dtype=np.float64)[order]
+
+        def by_region(sorted_result: np.ndarray) -> np.ndarray:
+            out = np.empty_like(sorted_result)
+            out[order] = sorted_result
+            return out
+
         # Moving averages (by region)
         for window in [7, 30]:
-            feature_df[f'load_ma_{window}d'] = feature_df.groupby('region')['val_cargaenergiamwmed'].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
-            feature_df[f'temp_ma_{window}d'] = feature_df.groupby('region')['temp_mean'].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
+            feature_df[f'load_ma_{window}d'] = by_region(group_rolling_mean(load, codes, window, bounds))
+            feature_df[f'temp_ma_{window}d'] = by_region(group_rolling_mean(temp, codes, window, bounds))
 
         # Z-scores for anomaly detection
-        feature_df['load_zscore'] = feature_df.groupby('region')['val_cargaenergiamwmed'].transform(
-            lambda x: (x - x.mean()) / x.std()
-        )
+        feature_df['load_zscore'] = by_region(group_zscore(load, codes, bounds))
 
         # Binary anomaly flag (Z-score > 2.5)
         feature_df['is_anomaly'] = (np.abs(feature_df['load_zscore']) > 2.5).astype(int)
 
         # Month-over-month changes
-        feature_df['load_mom'] = feature_df.groupby('region')['val_cargaenergiamwmed'].pct_change(periods=30)
+        feature_df['load_mom'] = by_region(group_pct_change(load, codes, 30))
 
         # Lag features (t-1, t-7) for ML models
         for lag in [1, 7]:
-            feature_df[f'load_lag_{lag}d'] = feature_df.groupby('region')['val_cargaenergiamwmed'].shift(lag)
-            feature_df[f'temp_lag_{lag}d'] = feature_df.groupby('region')['temp_mean'].shift(lag)
+            feature_df[f'load_lag_{lag}d'] = by_region(group_shift(load, codes, lag))
+            feature_df[f'temp_lag_{lag}d'] = by_region(group_shift(temp, codes, lag))
 
         # Interaction features
         feature_df['temp_x_dayofweek'] = feature_df['temp_mean'] * feature_df['day_of_week']
@@ -302,7 +318,9 @@ class Preprocessor:
         # Step 5: Save to disk
         if save:
             output_path = self.output_dir / "energy_weather_processed.parquet"
-            final_df.to_parquet(output_path, index=False)
+            write_processed_parquet(final_df, output_path)
+            # Arrow IPC copy used by the dashboard as a fast reload cache
+            write_processed_feather(final_df, output_path.with_suffix(".feather"))
             print(f"\n✓ Saved processed data to {output_path}")
 
         print("\n" + "=" * 60)
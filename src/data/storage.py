@@ -0,0 +1,251 @@
+"""
+Parquet storage helpers for processed energy/weather data.
+
+Centralizes how processed DataFrames are written to and read from disk so
+every script and dashboard uses the same layout: ZSTD compression,
+dictionary encoding for the low-cardinality text columns, delta encoding
+for dates, byte-stream-split encoding for float columns and compact
+dtypes (float32/uint8) for columns that do not need full precision.
+
+An uncompressed Arrow IPC (Feather) copy can be written next to the
+Parquet file as a fast reload cache for the dashboards.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+
+# Low-cardinality text columns (dictionary encoded)
+DICTIONARY_COLUMNS = ['region', 'season']
+
+# Rows per row group; large enough for a multi-year panel in a few groups
+ROW_GROUP_SIZE = 64_000
+
+# Measured load values (and their lagged copies), kept in float64 in memory
+# so tables and exports show the values as recorded by the ONS
+MEASURED_COLUMNS = ['val_cargaenergiamwmed', 'load_lag_1d', 'load_lag_7d']
+
+# Storage dtypes for columns that do not need float64/int64 precision.
+# Features are computed in float64 and only cast when written.
+STORAGE_DTYPES = {
+    'temp_mean': 'float32',
+    'temp_min': 'float32',
+    'temp_max': 'float32',
+    'temp_range': 'float32',
+    'radiation_mean': 'float32',
+    'precipitation_total': 'float32',
+    'load_zscore': 'float32',
+    'is_anomaly': 'uint8',
+}
+
+
+def downcast_for_storage(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast columns listed in STORAGE_DTYPES to their compact storage dtype.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        DataFrame with downcast columns (other columns untouched)
+    """
+    dtypes = {col: dtype for col, dtype in STORAGE_DTYPES.items() if col in df.columns}
+    return df.astype(dtypes, copy=False)
+
+
+def downcast_numeric(df: pd.DataFrame, exclude: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Shrink numeric columns for in-memory analysis.
+
+    float64 columns become float32 (enough for charts, statistics and
+    correlations) and int64 columns become the smallest integer type that
+    holds their values (e.g. is_anomaly -> int8).
+
+    Args:
+        df: DataFrame to downcast in place
+        exclude: Float columns to keep as float64 (e.g. MEASURED_COLUMNS,
+                 shown as-is in tables and exports)
+
+    Returns:
+        The same DataFrame, with downcast columns
+    """
+    float_cols = df.select_dtypes('float64').columns.difference(exclude, sort=False)
+    if len(float_cols):
+        df[float_cols] = df[float_cols].astype('float32')
+    for col in df.select_dtypes('int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def _column_encodings(table: pa.Table) -> dict:
+    """
+    Pick a Parquet encoding for each non-dictionary column of the table.
+
+    Args:
+        table: Arrow table about to be written
+
+    Returns:
+        Mapping of column name to Parquet encoding
+    """
+    encodings = {}
+    for field in table.schema:
+        if field.name in DICTIONARY_COLUMNS:
+            continue
+        if pa.types.is_timestamp(field.type):
+            encodings[field.name] = 'DELTA_BINARY_PACKED'
+        elif pa.types.is_floating(field.type):
+            encodings[field.name] = 'BYTE_STREAM_SPLIT'
+    return encodings
+
+
+def write_processed_parquet(df: pd.DataFrame, path: Union[str, Path]) -> Path:
+    """
+    Write a processed DataFrame to Parquet with schema-tuned encodings.
+
+    Columns in STORAGE_DTYPES are downcast before writing; text columns in
+    DICTIONARY_COLUMNS are dictionary encoded by the Parquet writer.
+
+    Args:
+        df: Processed DataFrame (output of Preprocessor or sample generator)
+        path: Destination file path
+
+    Returns:
+        Path to the written file
+
+    Example:
+        >>> write_processed_parquet(df, "data/processed/energy_weather_2023.parquet")
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(downcast_for_storage(df), preserve_index=False)
+    pq.write_table(
+        table,
+        path,
+        row_group_size=ROW_GROUP_SIZE,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=[c for c in DICTIONARY_COLUMNS if c in table.column_names],
+        column_encoding=_column_encodings(table),
+        write_statistics=True,
+    )
+    return path
+
+
+def write_processed_feather(df: pd.DataFrame, path: Union[str, Path]) -> Path:
+    """
+    Write a processed DataFrame as an uncompressed Arrow IPC (Feather v2) file.
+
+    Used as a reload cache next to the Parquet output: the file already has
+    Arrow's in-memory layout, so reading it back is a memory map instead of
+    a decode. Same storage dtypes as the Parquet file; DICTIONARY_COLUMNS
+    are stored dictionary encoded.
+
+    Args:
+        df: Processed DataFrame
+        path: Destination file path
+
+    Returns:
+        Path to the written file
+
+    Example:
+        >>> write_processed_feather(df, "data/processed/energy_weather_processed.feather")
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(downcast_for_storage(df), preserve_index=False)
+    for name in DICTIONARY_COLUMNS:
+        i = table.schema.get_field_index(name)
+        if i >= 0 and not pa.types.is_dictionary(table.schema.field(i).type):
+            table = table.set_column(i, name, table.column(i).dictionary_encode())
+    feather.write_feather(table, path, compression='uncompressed')
+    return path
+
+
+def read_processed_feather(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read a processed Feather file as an Arrow table, memory-mapped.
+
+    Args:
+        path: Feather file path (see ``write_processed_feather``)
+        columns: Columns to read (None = all columns)
+
+    Returns:
+        Arrow table backed by the mapped file
+    """
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def read_processed_table(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filters: Optional[list] = None,
+    read_dictionary: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read a processed Parquet file as an Arrow table (no pandas conversion).
+
+    The file is memory-mapped, so column buffers are decoded straight from
+    the OS page cache instead of through an intermediate read buffer.
+
+    Args:
+        path: Parquet file path
+        columns: Columns to read (None = all columns)
+        filters: PyArrow filter expressions, e.g. [('region', '=', 'Sul')]
+        read_dictionary: Columns to keep dictionary encoded (e.g.
+                         DICTIONARY_COLUMNS); they convert to pandas
+                         categoricals without materializing strings
+
+    Returns:
+        Arrow table with the requested columns and rows
+    """
+    return pq.read_table(
+        path,
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        read_dictionary=read_dictionary
+    )
+
+
+def scan_processed_table(
+    paths: Sequence[Union[str, Path]],
+    columns: Optional[List[str]] = None,
+    filter: Optional[ds.Expression] = None,
+    sort_by: Optional[str] = None
+) -> pa.Table:
+    """
+    Read several processed Parquet files as one Arrow table in a single scan.
+
+    Files are memory-mapped, scanned in parallel by Arrow and concatenated
+    without copying; the optional sort also runs on the Arrow table.
+
+    Args:
+        paths: Parquet file paths (e.g. one file per year)
+        columns: Columns to read (None = all columns)
+        filter: Dataset filter expression, e.g. ds.field('year').isin([2023])
+        sort_by: Column to sort the combined rows by (None = file order)
+
+    Returns:
+        Combined Arrow table
+    """
+    dataset = ds.dataset(
+        [str(Path(p).resolve()) for p in paths],
+        format='parquet',
+        filesystem=pafs.LocalFileSystem(use_mmap=True)
+    )
+    table = dataset.to_table(columns=columns, filter=filter)
+    if sort_by is not None:
+        table = table.sort_by(sort_by)
+    return table
+
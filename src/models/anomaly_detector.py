@@ -60,7 +60,8 @@ class AnomalyDetector:
                 n_estimators=100,
                 max_depth=10,
                 random_state=random_state,
-                class_weight='balanced'
+                class_weight='balanced',
+                n_jobs=-1
             )
         elif model_type == 'xgboost':
             if not XGBOOST_AVAILABLE:
@@ -113,7 +114,9 @@ class AnomalyDetector:
                 'Sudeste/Centro-Oeste': 2,
                 'Sul': 3
             }
-            features_df['region_code'] = df['region'].map(region_map)
+            # astype(object): a categorical 'region' would otherwise map to a
+            # categorical column, which the models cannot consume
+            features_df['region_code'] = df['region'].astype(object).map(region_map)
 
         # Advanced features (if available from preprocessor)
         advanced_features = [
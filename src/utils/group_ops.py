@@ -0,0 +1,243 @@
+"""
+Vectorized group-wise operations for panel (region x date) data.
+
+These helpers replace ``df.groupby(key)[col].transform(lambda x: ...)``
+calls with NumPy kernels that run over group-sorted arrays, so the work
+happens in compiled loops instead of one Python call per group.
+
+All kernels expect ``values`` and ``codes`` already sorted by group
+(see ``group_sort``), with rows of the same group stored contiguously.
+Group boundaries can be computed once with ``group_bounds`` and passed to
+every kernel that needs them, so the grouping work is done a single time.
+
+When Numba is installed, the rolling mean runs as a compiled running-sum
+loop; otherwise an equivalent cumulative-sum NumPy path is used.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+def _check_numba():
+    """Check if Numba is available for JIT-compiled kernels."""
+    try:
+        import numba
+        return True, numba
+    except ImportError:
+        return False, None
+
+
+NUMBA_AVAILABLE, numba = _check_numba()
+
+
+def group_sort(keys) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorize group keys and compute a stable order that groups rows.
+
+    The sort is stable, so the original row order inside each group is
+    preserved (same semantics as ``DataFrame.groupby``).
+
+    Args:
+        keys: Group labels (e.g., the 'region' column)
+
+    Returns:
+        Tuple (sorted_codes, order) where ``order`` sorts rows by group
+        and ``sorted_codes`` are the integer group codes in that order
+
+    Example:
+        >>> codes, order = group_sort(df['region'])
+        >>> values = df['val_cargaenergiamwmed'].to_numpy()[order]
+    """
+    codes, _ = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    return codes[order], order
+
+
+def group_bounds(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start offset and length of each contiguous group in sorted codes.
+
+    Args:
+        codes: Group-sorted integer group codes (from ``group_sort``)
+
+    Returns:
+        Tuple (starts, counts)
+
+    Example:
+        >>> codes, order = group_sort(df['region'])
+        >>> bounds = group_bounds(codes)
+        >>> zscore = group_zscore(values, codes, bounds)
+    """
+    n = len(codes)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    return starts, counts
+
+
+def group_zscore(
+    values: np.ndarray,
+    codes: np.ndarray,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Z-score of each value relative to its group (ddof=1, NaN-aware).
+
+    Equivalent to ``groupby(key).transform(lambda x: (x - x.mean()) / x.std())``.
+
+    Args:
+        values: Group-sorted float values
+        codes: Group-sorted integer group codes
+        bounds: Precomputed ``group_bounds(codes)`` (computed if None)
+
+    Returns:
+        Array of z-scores aligned with ``values``
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts, counts = bounds if bounds is not None else group_bounds(codes)
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    valid = ~np.isnan(values)
+    n = np.add.reduceat(valid.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / n
+        dev = values - np.repeat(mean, counts)
+        ss = np.add.reduceat(np.where(valid, dev * dev, 0.0), starts)
+        std = np.sqrt(ss / (n - 1))
+        std[n < 2] = np.nan
+        return dev / np.repeat(std, counts)
+
+
+def _rolling_mean_running_sum(values, codes, window, out):
+    """
+    Running-sum rolling mean: adds the entering value and subtracts the
+    one leaving the window, resetting the sums at every group boundary.
+    """
+    total = 0.0
+    count = 0
+    start = 0
+    for i in range(values.size):
+        if i == 0 or codes[i] != codes[i - 1]:
+            total = 0.0
+            count = 0
+            start = i
+
+        value = values[i]
+        if not np.isnan(value):
+            total += value
+            count += 1
+
+        if i - window >= start:
+            leaving = values[i - window]
+            if not np.isnan(leaving):
+                total -= leaving
+                count -= 1
+
+        out[i] = total / count if count > 0 else np.nan
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _rolling_mean_running_sum = numba.njit(cache=True)(_rolling_mean_running_sum)
+
+
+def _rolling_mean_cumsum(
+    values: np.ndarray,
+    window: int,
+    bounds: Tuple[np.ndarray, np.ndarray]
+) -> np.ndarray:
+    """Rolling mean from global cumulative sums, clipped at group starts."""
+    starts, counts = bounds
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    valid = ~np.isnan(values)
+    csum = np.r_[0.0, np.cumsum(np.where(valid, values, 0.0))]
+    ccnt = np.r_[0, np.cumsum(valid)]
+
+    idx = np.arange(len(values))
+    lo = np.maximum(idx - window + 1, np.repeat(starts, counts))
+    window_sum = csum[idx + 1] - csum[lo]
+    window_cnt = ccnt[idx + 1] - ccnt[lo]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_cnt > 0, window_sum / window_cnt, np.nan)
+
+
+def group_rolling_mean(
+    values: np.ndarray,
+    codes: np.ndarray,
+    window: int,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Trailing rolling mean within each group (min_periods=1, NaN-aware).
+
+    Equivalent to
+    ``groupby(key).transform(lambda x: x.rolling(window, min_periods=1).mean())``,
+    computed in O(N) instead of re-summing each window: a JIT-compiled
+    running sum when Numba is available, cumulative sums otherwise.
+
+    Args:
+        values: Group-sorted float values
+        codes: Group-sorted integer group codes
+        window: Window size in rows
+        bounds: Precomputed ``group_bounds(codes)`` (computed if None;
+                unused by the Numba kernel, which detects boundaries inline)
+
+    Returns:
+        Array of rolling means aligned with ``values``
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        out = np.empty(len(values), dtype=np.float64)
+        return _rolling_mean_running_sum(values, np.ascontiguousarray(codes), window, out)
+    return _rolling_mean_cumsum(values, window, bounds if bounds is not None else group_bounds(codes))
+
+
+def group_shift(values: np.ndarray, codes: np.ndarray, lag: int) -> np.ndarray:
+    """
+    Shift values forward by ``lag`` rows without crossing group boundaries.
+
+    Equivalent to ``groupby(key)[col].shift(lag)`` for positive lags.
+
+    Args:
+        values: Group-sorted values
+        codes: Group-sorted integer group codes
+        lag: Number of rows to shift (must be >= 1)
+
+    Returns:
+        Float array with NaN where no lagged value exists in the group
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if lag < len(values):
+        out[lag:] = values[:-lag]
+        out[lag:][codes[lag:] != codes[:-lag]] = np.nan
+    return out
+
+
+def group_pct_change(values: np.ndarray, codes: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Percentage change over ``periods`` rows within each group.
+
+    Equivalent to ``groupby(key)[col].pct_change(periods=periods)``
+    for series without missing values.
+
+    Args:
+        values: Group-sorted float values
+        codes: Group-sorted integer group codes
+        periods: Number of rows to look back
+
+    Returns:
+        Array of relative changes aligned with ``values``
+    """
+    values = np.asarray(values, dtype=np.float64)
+    previous = group_shift(values, codes, periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return values / previous - 1.0